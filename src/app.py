@@ -2,13 +2,22 @@
 
 import os
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Optional
 
 from config import ConfigManager
 from auth import AuthManager
+from deadline import get_deadline
 from installation import InstallationManager
 from launcher import MinecraftLauncher
-from exceptions import QuickMCError
+from fleet import FleetLauncher
+from garbage_collector import GarbageCollector
+from mod_profiler import LaunchHistory
+from server_ping import ServerPinger
+from version_data import version_json_path
+from exceptions import LaunchError, QuickMCError
+
+GC_HISTORY_VERSIONS = 5  # Launch history entries whose versions are kept by gc
+DEFAULT_INSTANCE = "default"
 
 
 class QuickMCApp:
@@ -19,44 +28,135 @@ class QuickMCApp:
         self.install_dir = install_dir or os.path.join(os.path.expanduser("~"), "QuickMC")
         self.minecraft_dir = os.path.join(self.install_dir, ".minecraft")
         self.data_dir = os.path.join(self.install_dir, "data")
+        self.instances_dir = os.path.join(self.install_dir, "instances")
 
         # Ensure directories exist
         os.makedirs(self.minecraft_dir, exist_ok=True)
         os.makedirs(self.data_dir, exist_ok=True)
 
-        # Initialize managers
-        self.config_manager = ConfigManager(self.data_dir)
-        self.auth_manager = AuthManager(self.data_dir, debug_oauth)
-
         # Load configuration
+        self.config_manager = ConfigManager(self.data_dir)
         self.config = self.config_manager.load_config()
 
+        # Initialize managers
+        self.auth_manager = AuthManager(self.data_dir, debug_oauth, get_deadline(self.config, "auth"))
+
         # Initialize other managers with config
-        self.installation_manager = InstallationManager(self.minecraft_dir, self.config)
-        self.launcher = MinecraftLauncher(self.minecraft_dir, self.config)
+        self.installation_manager = InstallationManager(self.minecraft_dir, self.config, self.data_dir)
+        self.launcher = MinecraftLauncher(self.minecraft_dir, self.config, self.data_dir)
 
-    def run(self) -> None:
-        # sourcery skip: extract-duplicate-method, extract-method
+    def run(self, instance: str = DEFAULT_INSTANCE) -> None:
         """Run the complete QuickMC launch process."""
-        try:
-            print("Starting QuickMC launcher...")
+        self._run_guarded(self._launch, instance)
+
+    def run_fleet(self, count: int, accounts_path: Optional[str] = None, username_prefix: Optional[str] = None) -> None:
+        """Launch a fleet of clients concurrently for server load testing."""
+        self._run_guarded(self._launch_fleet, count, accounts_path, username_prefix)
+
+    def run_daemon(self) -> None:
+        """Run the resident launcher daemon until it is stopped."""
+        from daemon import LauncherDaemon  # Import here to avoid circular imports
+
+        self._run_guarded(LauncherDaemon(self).serve)
+
+    def run_cache_server(self) -> None:
+        """Serve this machine's installed artifacts to other QuickMC instances on the network."""
+        self._run_guarded(self.installation_manager.artifact_cache.serve)
+
+    def run_gc(self, delete: bool = False, archive_dir: Optional[str] = None, keep: Optional[List[str]] = None) -> None:
+        """Remove or archive versions, libraries, assets and runtimes that nothing uses anymore."""
+        self._run_guarded(self._collect_garbage, delete, archive_dir, keep or [])
+
+    def _collect_garbage(self, delete: bool, archive_dir: Optional[str], keep: List[str]) -> None:
+        """Build the set of versions in use and collect everything they do not reference."""
+        roots = set(keep)
+
+        current_version = self.installation_manager.resolve_installed_version(self.config["minecraft_version"])
+        if current_version:
+            roots.add(current_version)
+
+        # Recently launched versions stay so switching back does not trigger a reinstall
+        for entry in LaunchHistory(self.data_dir).load()[-GC_HISTORY_VERSIONS:]:
+            if entry.get("version") and os.path.isfile(version_json_path(self.minecraft_dir, entry["version"])):
+                roots.add(entry["version"])
+
+        GarbageCollector(self.minecraft_dir).collect(sorted(roots), delete, archive_dir)
+
+    def get_game_dir(self, instance: str) -> str:
+        """Get the game directory of an instance."""
+        if instance == DEFAULT_INSTANCE:
+            return self.minecraft_dir
+
+        game_dir = os.path.join(self.instances_dir, instance)
+        # The name must be a single directory inside instances/, not a path or "." / ".."
+        if (os.path.basename(game_dir) != instance or instance in ("", os.curdir, os.pardir)
+                or not os.path.isdir(game_dir)):
+            raise LaunchError(f"Unknown instance: {instance}")
+        return game_dir
+
+    def start_quick_join(self) -> Optional[ServerPinger]:
+        """Start pinging the launch.quick_join servers in the background, if any are configured."""
+        launch_config = self.config["launch"]
+        if not launch_config.get("quick_join"):
+            return None
+        return ServerPinger(launch_config["quick_join"], launch_config.get("quick_join_timeout", 3)).start()
+
+    @staticmethod
+    def pick_quick_join_server(pinger: Optional[ServerPinger]) -> Optional[str]:
+        """Wait for the quick-join pings and get the address of the server to join."""
+        if pinger is None:
+            return None
+        print("Picking a server to join...")
+        best = pinger.best()
+        if best is None:
+            print("Warning: No quick-join server answered, launching to the main menu")
+            return None
+        print(f"Joining {best.address}")
+        return best.address
+
+    def _launch(self, instance: str) -> None:
+        # sourcery skip: extract-duplicate-method, extract-method
+        """Authenticate, install and launch a single client."""
+        print("Starting QuickMC launcher...")
+        game_dir = self.get_game_dir(instance)
+
+        # Servers are pinged while authentication and installation run
+        pinger = self.start_quick_join()
+
+        # Step 1: Authenticate user
+        print("Authenticating...")
+        login_data = self.auth_manager.authenticate()
+        print(f"Authenticated as: {login_data['name']}")
 
-            # Step 1: Authenticate user
-            print("Authenticating...")
-            login_data = self.auth_manager.authenticate()
-            print(f"Authenticated as: {login_data['name']}")
+        # Step 2: Install Minecraft version
+        minecraft_version = self.config["minecraft_version"]
+        print(f"Preparing Minecraft {minecraft_version}...")
+        actual_version = self.installation_manager.install_minecraft_version(minecraft_version)
 
-            # Step 2: Install Minecraft version
-            minecraft_version = self.config["minecraft_version"]
-            print(f"Preparing Minecraft {minecraft_version}...")
-            actual_version = self.installation_manager.install_minecraft_version(minecraft_version)
+        server = self.pick_quick_join_server(pinger)
 
-            # Step 3: Launch Minecraft
-            print(f"Launching {actual_version}...")
-            self.launcher.launch(actual_version, login_data)
+        # Step 3: Launch Minecraft
+        print(f"Launching {actual_version}...")
+        self.launcher.launch(actual_version, login_data, server, game_dir)
 
-            print("Launch completed successfully!")
+        print("Launch completed successfully!")
 
+    def _launch_fleet(self, count: int, accounts_path: Optional[str], username_prefix: Optional[str]) -> None:
+        """Install once, then launch every fleet client."""
+        fleet = FleetLauncher(self.launcher, self.install_dir, self.config)
+        accounts = fleet.build_accounts(count, accounts_path, username_prefix)
+
+        minecraft_version = self.config["minecraft_version"]
+        print(f"Preparing Minecraft {minecraft_version}...")
+        actual_version = self.installation_manager.install_minecraft_version(minecraft_version)
+
+        clients = fleet.run(actual_version, accounts)
+        fleet.print_summary(clients)
+
+    def _run_guarded(self, func: Callable[..., None], *args: Any) -> None:
+        """Run a launcher step, reporting errors and exiting on failure."""
+        try:
+            func(*args)
         except KeyboardInterrupt:
             print("\nLauncher interrupted by user.")
             sys.exit(1)
@@ -81,5 +181,5 @@ class QuickMCApp:
         self.config_manager.save_config(new_config)
 
         # Recreate managers with new config
-        self.installation_manager = InstallationManager(self.minecraft_dir, self.config)
-        self.launcher = MinecraftLauncher(self.minecraft_dir, self.config)
+        self.installation_manager = InstallationManager(self.minecraft_dir, self.config, self.data_dir)
+        self.launcher = MinecraftLauncher(self.minecraft_dir, self.config, self.data_dir)
@@ -0,0 +1,316 @@
+"""LAN artifact cache so a fleet of machines downloads each file from upstream only once."""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from version_data import load_version_json, maven_path
+
+SHA1_PATTERN = re.compile(r"[0-9a-f]{40}")
+PEER_RETRY_DELAY = 60  # Seconds before retrying a peer that failed
+
+# The download hook is installed once per process and routes through the most recent cache
+_original_download = None
+_active_cache: Optional["ArtifactCache"] = None
+_hook_lock = threading.Lock()
+
+
+class ArtifactStore:
+    """Content-addressed index (SHA1 to file) of everything installed into the Minecraft directory."""
+
+    def __init__(self, minecraft_dir: str, data_dir: str):
+        self.minecraft_dir = os.path.realpath(minecraft_dir)
+        self.index_path = os.path.join(data_dir, "artifacts.json")
+        self._lock = threading.Lock()
+        self._index: Dict[str, str] = {}
+        self._index_mtime: Optional[float] = None
+        self._dirty = False
+        self._load_index()
+
+    def record(self, sha1: str, path: str) -> None:
+        """Remember where the file with a hash lives."""
+        relative_path = os.path.relpath(os.path.realpath(path), self.minecraft_dir)
+        if relative_path.startswith(os.pardir):
+            return
+        with self._lock:
+            if self._index.get(sha1) != relative_path:
+                self._index[sha1] = relative_path
+                self._dirty = True
+
+    def lookup(self, sha1: str) -> Optional[str]:
+        """Find a local file with the given hash."""
+        # Asset objects are already stored by hash
+        asset_path = os.path.join(self.minecraft_dir, "assets", "objects", sha1[:2], sha1)
+        if os.path.isfile(asset_path):
+            return asset_path
+
+        path = self._lookup_index(sha1)
+        if path is None and self._reload_if_changed():
+            path = self._lookup_index(sha1)
+        return path
+
+    def index_installed_versions(self) -> int:
+        """Record every file the installed version JSONs list with a SHA1, returning how many were found."""
+        versions_dir = os.path.join(self.minecraft_dir, "versions")
+        try:
+            version_ids = [entry.name for entry in os.scandir(versions_dir) if entry.is_dir()]
+        except OSError:
+            return 0
+
+        count = 0
+        for version_id in version_ids:
+            version_data = load_version_json(self.minecraft_dir, version_id)
+            if version_data is None:
+                continue
+            for sha1, relative_path, size in self._iter_version_files(version_id, version_data):
+                path = os.path.join(self.minecraft_dir, relative_path)
+                try:
+                    actual_size = os.path.getsize(path)
+                except OSError:
+                    continue
+                # The size is a cheap guard against stale files, peers verify the hash anyway
+                if size is not None and actual_size != size:
+                    continue
+                self.record(sha1, path)
+                count += 1
+        return count
+
+    @staticmethod
+    def _iter_version_files(version_id: str, version_data: Dict[str, Any]) -> Iterator[Tuple[str, str, Optional[int]]]:
+        """Yield (sha1, path relative to the Minecraft directory, size) for the files a version JSON lists."""
+        client = version_data.get("downloads", {}).get("client", {})
+        if client.get("sha1"):
+            yield client["sha1"], os.path.join("versions", version_id, f"{version_id}.jar"), client.get("size")
+
+        asset_index = version_data.get("assetIndex", {})
+        if asset_index.get("sha1") and asset_index.get("id"):
+            yield asset_index["sha1"], os.path.join("assets", "indexes", f"{asset_index['id']}.json"), asset_index.get("size")
+
+        log_file = version_data.get("logging", {}).get("client", {}).get("file", {})
+        if log_file.get("sha1") and log_file.get("id"):
+            yield log_file["sha1"], os.path.join("assets", "log_configs", log_file["id"]), log_file.get("size")
+
+        for library in version_data.get("libraries", []):
+            downloads = library.get("downloads", {})
+            artifacts = [downloads.get("artifact", {}), *downloads.get("classifiers", {}).values()]
+            for artifact in artifacts:
+                if artifact.get("sha1") and artifact.get("path"):
+                    yield artifact["sha1"], os.path.join("libraries", artifact["path"]), artifact.get("size")
+            # Fabric profiles list Maven coordinates with the hash next to them
+            if "downloads" not in library and library.get("sha1") and library.get("name"):
+                yield library["sha1"], os.path.join("libraries", maven_path(library["name"])), library.get("size")
+
+    def save(self) -> None:
+        """Write the index if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            index = dict(self._index)
+            self._dirty = False
+
+        # Merge with entries recorded by other QuickMC processes in the meantime
+        index = {**self._read_index_file(), **index}
+        temp_path = self.index_path + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(index, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"Warning: Failed to save artifact index: {e}")
+
+    def _lookup_index(self, sha1: str) -> Optional[str]:
+        with self._lock:
+            relative_path = self._index.get(sha1)
+        if relative_path is None:
+            return None
+        path = os.path.join(self.minecraft_dir, relative_path)
+        return path if os.path.isfile(path) else None
+
+    def _load_index(self) -> None:
+        self._index = self._read_index_file()
+        try:
+            self._index_mtime = os.path.getmtime(self.index_path)
+        except OSError:
+            self._index_mtime = None
+
+    def _reload_if_changed(self) -> bool:
+        """Reload the index if another process has updated it."""
+        try:
+            mtime = os.path.getmtime(self.index_path)
+        except OSError:
+            return False
+        if mtime == self._index_mtime:
+            return False
+
+        with self._lock:
+            self._index = {**self._read_index_file(), **self._index}
+            self._index_mtime = mtime
+        return True
+
+    def _read_index_file(self) -> Dict[str, str]:
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+class PeerFetcher:
+    """Fetches files by hash from other QuickMC cache servers, verifying every download."""
+
+    def __init__(self, peers: List[str], timeout: float = 2.0):
+        self.peers = [peer if "://" in peer else f"http://{peer}" for peer in peers]
+        self.timeout = timeout
+        self._failed_until: Dict[str, float] = {}
+
+    def fetch(self, sha1: str, path: str) -> bool:
+        """Try to download a file from the peers, returning True if a verified copy was written."""
+        for peer in self.peers:
+            if self._failed_until.get(peer, 0) > time.monotonic():
+                continue
+            try:
+                if self._fetch_from(peer, sha1, path):
+                    return True
+            except OSError:
+                # Skip unreachable peers for a while instead of paying the timeout on every file
+                self._failed_until[peer] = time.monotonic() + PEER_RETRY_DELAY
+        return False
+
+    def _fetch_from(self, peer: str, sha1: str, path: str) -> bool:
+        url = f"{peer.rstrip('/')}/sha1/{sha1}"
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response, open(temp_path, "wb") as f:
+                digest = hashlib.sha1()
+                for chunk in iter(lambda: response.read(1048576), b""):
+                    digest.update(chunk)
+                    f.write(chunk)
+        except urllib.error.HTTPError:
+            # The peer is up but does not have this file
+            self._remove(temp_path)
+            return False
+        except OSError:
+            self._remove(temp_path)
+            raise
+
+        if digest.hexdigest() != sha1:
+            print(f"Warning: Peer {peer} sent a corrupt copy of {sha1}, ignoring it")
+            self._remove(temp_path)
+            return False
+
+        os.replace(temp_path, path)
+        return True
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class ArtifactCache:
+    """Peer-first downloads for installs, plus the store this machine serves to its peers."""
+
+    def __init__(self, minecraft_dir: str, data_dir: str, config: Dict[str, Any]):
+        cache_config = config.get("cache", {})
+        self.store = ArtifactStore(minecraft_dir, data_dir)
+        self.fetcher = PeerFetcher(cache_config.get("peers", []), cache_config.get("peer_timeout", 2))
+        self.bind = cache_config.get("serve_bind", "0.0.0.0")
+        self.port = cache_config.get("serve_port", 25590)
+
+    def fetch(self, sha1: Optional[str], path: str) -> bool:
+        """Try to fill a missing file from the peers."""
+        if not sha1 or not self.fetcher.peers or os.path.isfile(path):
+            return False
+        return self.fetcher.fetch(sha1, path)
+
+    def install_download_hook(self) -> None:
+        """Route minecraft_launcher_lib downloads through the peer cache."""
+        global _original_download, _active_cache
+        import minecraft_launcher_lib as mcl
+
+        with _hook_lock:
+            _active_cache = self
+            if _original_download is not None:
+                return
+            original = _original_download = mcl._helper.download_file
+
+            @functools.wraps(original)
+            def download_file(url: str, path: str, *args: Any, **kwargs: Any) -> bool:
+                # download_file(url, path, callback, sha1, ...)
+                sha1 = kwargs["sha1"] if "sha1" in kwargs else (args[1] if len(args) > 1 else None)
+                cache = _active_cache
+                cache.fetch(sha1, path)
+
+                # The original skips files that are already present with the right hash
+                result = original(url, path, *args, **kwargs)
+                if sha1:
+                    cache.store.record(sha1, path)
+                return result
+
+            # Submodules import download_file by name, so patch every reference to it
+            for module_name, module in list(sys.modules.items()):
+                if module_name.startswith("minecraft_launcher_lib") and getattr(module, "download_file", None) is original:
+                    module.download_file = download_file
+
+    def serve(self) -> None:
+        """Serve the artifact store to peers until interrupted."""
+        # Versions installed before the cache existed, or by another launcher, were never recorded
+        print(f"Indexed {self.store.index_installed_versions()} installed files")
+        self.store.save()
+
+        server = CacheServer((self.bind, self.port), self.store)
+        print(f"Serving artifact cache on http://{self.bind}:{server.server_port}")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+class CacheServer(ThreadingHTTPServer):
+    """HTTP server that answers GET /sha1/<hash> from an artifact store."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, store: ArtifactStore):
+        self.store = store
+        super().__init__(address, _CacheRequestHandler)
+
+
+class _CacheRequestHandler(BaseHTTPRequestHandler):
+    server: CacheServer
+
+    def do_GET(self) -> None:
+        prefix, _, sha1 = self.path.rpartition("/")
+        if prefix != "/sha1" or not SHA1_PATTERN.fullmatch(sha1):
+            self.send_error(404)
+            return
+
+        path = self.server.store.lookup(sha1)
+        if path is None:
+            self.send_error(404)
+            return
+
+        with open(path, "rb") as f:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Serving thousands of asset objects would flood the console
+        pass
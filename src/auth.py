@@ -1,5 +1,6 @@
 """Authentication management for QuickMC launcher."""
 
+import base64
 import json
 import os
 import time
@@ -7,11 +8,16 @@ import pprint
 import webbrowser
 from typing import Dict, Any, Optional
 import minecraft_launcher_lib as mcl
+import requests
 import webview
 
-from exceptions import AuthenticationError
+from deadline import DEFAULT_DEADLINES, call_with_deadline
+from exceptions import AuthenticationError, DeadlineExceededError
 from platform_utils import WebViewManager
 
+# Failures that say nothing about whether the token itself is still accepted
+TRANSPORT_ERRORS = (requests.RequestException, OSError)
+
 
 class AuthManager:
     """Manages Minecraft authentication and token caching."""
@@ -19,10 +25,12 @@ class AuthManager:
     CLIENT_ID = "35292a04-c714-4fac-92e0-82c3ea360278"
     REDIRECT_URI = "http://localhost:8000/completeLogin"
     TOKEN_EXPIRY_BUFFER = 300  # 5 minutes buffer before token expiry
+    TOKEN_LIFETIME = 86400  # Minecraft access tokens are valid for 24 hours
 
-    def __init__(self, data_dir: str, debug_oauth: bool = False):
+    def __init__(self, data_dir: str, debug_oauth: bool = False, deadline: float = DEFAULT_DEADLINES["auth"]):
         self.data_dir = data_dir
         self.debug_oauth = debug_oauth
+        self.deadline = deadline
         self.login_data_path = os.path.join(data_dir, "login_data.json")
         self._login_data: Optional[Dict[str, Any]] = None
 
@@ -35,6 +43,12 @@ class AuthManager:
         # Perform complete login
         return self._complete_login()
 
+    def refresh_cached_login(self) -> Optional[Dict[str, Any]]:
+        """Validate or refresh cached login data without ever starting an interactive login."""
+        if self._try_cached_authentication():
+            return self._login_data
+        return None
+
     def _try_cached_authentication(self) -> bool:
         """Try to authenticate using cached or refreshed tokens."""
         cached_data = self._load_cached_login_data()
@@ -51,6 +65,26 @@ class AuthManager:
             self._login_data = cached_data
             return True
 
+        # Revalidation runs under the auth deadline and keeps going in the background if it is slow
+        try:
+            if call_with_deadline(self.deadline, self._revalidate_cached_token, cached_data, current_time):
+                return True
+            # The servers answered and rejected the token, so it must not be used even if it has not expired
+            return False
+        except DeadlineExceededError as e:
+            print(f"Token revalidation is slow ({e}), continuing in the background")
+        except TRANSPORT_ERRORS as e:
+            print(f"Could not reach the authentication servers: {e}")
+
+        return self._try_unexpired_token(cached_data, current_time)
+
+    def _revalidate_cached_token(self, cached_data: Dict[str, Any], current_time: float) -> bool:
+        """Validate or refresh a cached token over the network.
+
+        Returns False when the servers rejected the token; transport failures are raised.
+        """
+        time_since_cache = current_time - cached_data.get("cache_timestamp", 0)
+
         # If token is still valid (< 50 minutes), validate it
         # sourcery skip: merge-nested-ifs
         if time_since_cache < 3000:  # 50 minutes
@@ -63,6 +97,26 @@ class AuthManager:
 
         return False
 
+    def _try_unexpired_token(self, cached_data: Dict[str, Any], current_time: float) -> bool:
+        """Fall back to a cached token that has not actually expired yet."""
+        remaining = self._get_token_expiry(cached_data) - current_time
+        if remaining <= self.TOKEN_EXPIRY_BUFFER:
+            return False
+
+        print(f"Using cached login data, token is valid for another {remaining / 60:.0f} minutes")
+        self._login_data = cached_data
+        return True
+
+    def _get_token_expiry(self, login_data: Dict[str, Any]) -> float:
+        """Get the real expiry time of a Minecraft access token."""
+        # Minecraft access tokens are JWTs, so the expiry can be read without a network call
+        try:
+            payload = login_data["access_token"].split(".")[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+            return float(claims["exp"])
+        except (KeyError, IndexError, ValueError, TypeError, AttributeError):
+            return login_data.get("cache_timestamp", 0) + self.TOKEN_LIFETIME
+
     def _load_cached_login_data(self) -> Optional[Dict[str, Any]]:
         """Load cached login data from file."""
         if not os.path.exists(self.login_data_path):
@@ -76,7 +130,7 @@ class AuthManager:
             return None
 
     def _validate_cached_token(self, cached_data: Dict[str, Any], current_time: float) -> bool:
-        """Validate cached token and update timestamp if valid."""
+        """Validate cached token and update timestamp if valid, raising transport failures rather than returning False."""
         try:
             mcl.microsoft_account.validate_token(cached_data["access_token"])
             print("Cached token is still valid")
@@ -86,12 +140,14 @@ class AuthManager:
             self._save_login_data(cached_data)
             self._login_data = cached_data
             return True
+        except TRANSPORT_ERRORS:
+            raise
         except Exception as e:
             print(f"Cached token validation failed: {e}")
             return False
 
     def _try_refresh_token(self, cached_data: Dict[str, Any]) -> bool:
-        """Try to refresh the authentication token."""
+        """Try to refresh the authentication token, raising transport failures rather than returning False."""
         try:
             print("Refreshing login token...")
             refreshed_data = mcl.microsoft_account.complete_refresh(
@@ -114,6 +170,8 @@ class AuthManager:
             print("Token refresh successful")
             return True
 
+        except TRANSPORT_ERRORS:
+            raise
         except Exception as e:
             print(f"Token refresh failed: {e}")
             return False
@@ -163,16 +221,18 @@ class AuthManager:
         try:
             webview.create_window("Log in with Microsoft", url, width=800, height=600)
 
-            # Try different backends based on platform
-            backends = WebViewManager.get_backends()
-            for backend in backends:
+            # Try the backend that worked last time, then the ones that are installed, based on platform
+            manager = WebViewManager(self.data_dir)
+            for backend in manager.select_backends():
                 try:
                     print(f"Trying webview backend: {backend}")
                     webview.start(private_mode=False, func=web_server.start, gui=backend, debug=False)
                     print(f"Successfully started webview with {backend}")
+                    manager.remember(backend)
                     return True
                 except Exception as e:
                     print(f"Failed to start webview with {backend}: {e}")
+                    manager.forget()
             raise Exception("All webview backends failed") # sourcery skip: raise-specific-error
 
         except Exception as e:
@@ -0,0 +1,214 @@
+"""Merged, uncompressed classpath archives for faster class loading."""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+import zipfile
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+ARCHIVE_PREFIX = "quickmc-classpath-"
+# Libraries Fabric loader identifies by their own code source (its LoaderLibrary set). Knot treats
+# every class from those jars as a loader class, so merging game libraries into one of them would
+# hide those libraries from Knot and from mixins.
+SEPARATE_LIBRARY_PREFIXES = (
+    "net/fabricmc/",
+    "org/ow2/asm/",
+    "org/ow2/sat4j/",
+    "org/apache/logging/log4j/",
+    "org/slf4j/"
+)
+SIGNATURE_SUFFIXES = (".SF", ".RSA", ".DSA", ".EC")
+
+
+class ClasspathArchive:
+    """Replaces most library jars on a launch classpath with one merged, stored (uncompressed) jar."""
+
+    def __init__(self, minecraft_dir: str):
+        self.minecraft_dir = minecraft_dir
+        self.libraries_dir = os.path.join(minecraft_dir, "libraries")
+        self._lock = threading.Lock()
+
+    def apply(self, command: List[str], version: str) -> List[str]:
+        """Get the command with its classpath using the merged archive, building it if libraries changed."""
+        for flag in ("-cp", "-classpath"):
+            if flag in command:
+                index = command.index(flag) + 1
+                break
+        else:
+            return command
+
+        entries = command[index].split(os.pathsep)
+        version_dir = os.path.join(self.minecraft_dir, "versions", version)
+        archive = os.path.join(version_dir, f"{ARCHIVE_PREFIX}{self._fingerprint(entries)}.jar")
+        manifest = os.path.splitext(archive)[0] + ".json"
+
+        # An archive built for this exact classpath records which entries it merged, so the
+        # jars only have to be opened and checked when the classpath changes
+        merged = self._load_manifest(archive, manifest)
+        if merged is None:
+            merged = {entry for entry in entries if self._is_mergeable(entry)}
+            if len(merged) < 2:
+                return command
+
+        positions = [position for position, entry in enumerate(entries) if entry in merged]
+        segment = entries[positions[0]:positions[-1] + 1]
+        try:
+            self._ensure_archive(archive, manifest, segment, merged)
+        except (OSError, ValueError, zipfile.BadZipFile, zipfile.LargeZipFile) as e:
+            print(f"Warning: Failed to build the merged classpath archive, using the plain classpath: {e}")
+            return command
+
+        # The archive takes the place of the first merged jar. Unmerged entries that sat between merged
+        # jars follow it; the archive leaves out whatever they shadowed, so lookup order is unchanged.
+        classpath = (entries[:positions[0]] + [archive] + [entry for entry in segment if entry not in merged]
+                     + entries[positions[-1] + 1:])
+        return command[:index] + [os.pathsep.join(classpath)] + command[index + 1:]
+
+    def _is_mergeable(self, entry: str) -> bool:
+        """Check if a classpath entry is a plain library jar that is safe to merge."""
+        if not entry.endswith(".jar") or not os.path.isfile(entry):
+            return False
+        relative = os.path.relpath(entry, self.libraries_dir).replace(os.sep, "/")
+        if relative.startswith("../") or relative.startswith(SEPARATE_LIBRARY_PREFIXES):
+            return False
+        try:
+            with zipfile.ZipFile(entry) as jar:
+                # Signatures only cover the original jar
+                return not any(name.startswith("META-INF/") and name.endswith(SIGNATURE_SUFFIXES)
+                               for name in jar.namelist())
+        except (OSError, zipfile.BadZipFile):
+            return False
+
+    @staticmethod
+    def _fingerprint(entries: List[str]) -> str:
+        """Identify a classpath by its entries' paths, sizes and modification times."""
+        fingerprint = hashlib.sha1()
+        for entry in entries:
+            try:
+                stat = os.stat(entry)
+                fingerprint.update(f"{entry}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+            except OSError:
+                fingerprint.update(f"{entry}\0missing\n".encode())
+        return fingerprint.hexdigest()[:16]
+
+    @staticmethod
+    def _load_manifest(archive: str, manifest: str) -> Optional[Set[str]]:
+        """Get the entries merged into an existing archive, or None if it has to be (re)built."""
+        if not os.path.isfile(archive):
+            return None
+        try:
+            with open(manifest, "r") as f:
+                merged = set(json.load(f)["merged"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return merged if len(merged) >= 2 else None
+
+    def _ensure_archive(self, archive: str, manifest: str, segment: List[str], merged: Set[str]) -> None:
+        """Build the archive and its manifest if they are missing, removing stale ones."""
+        with self._lock:
+            if self._load_manifest(archive, manifest) == merged:
+                return
+
+            print(f"Building merged classpath archive from {len(merged)} libraries...")
+            self._build(archive, segment, merged)
+            # The manifest is written last, so it only exists next to a complete archive
+            temp_path = f"{manifest}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"merged": [entry for entry in segment if entry in merged]}, f)
+            os.replace(temp_path, manifest)
+
+            version_dir = os.path.dirname(archive)
+            for pattern in (f"{ARCHIVE_PREFIX}*.jar", f"{ARCHIVE_PREFIX}*.json"):
+                for stale in glob.glob(os.path.join(version_dir, pattern)):
+                    if stale not in (archive, manifest):
+                        os.remove(stale)
+
+    def _build(self, archive: str, segment: List[str], merged: Set[str]) -> None:
+        """Write the merged jar: first entry wins, service files are concatenated, nothing is compressed.
+
+        Entries provided by an unmerged classpath entry earlier in the segment are left out, that
+        entry comes after the archive on the classpath and has to keep serving them.
+        """
+        entries: Dict[str, Tuple[str, str]] = {}
+        services: Dict[str, List[bytes]] = {}
+        shadowed: Set[str] = set()
+        multi_release = False
+
+        for jar in segment:
+            if jar not in merged:
+                shadowed.update(self._list_names(jar))
+                continue
+            with zipfile.ZipFile(jar) as source:
+                for info in source.infolist():
+                    name = info.filename
+                    if name == "META-INF/MANIFEST.MF":
+                        multi_release = multi_release or b"Multi-Release: true" in source.read(info)
+                    elif name.startswith("META-INF/services/") and not info.is_dir():
+                        services.setdefault(name, []).append(source.read(info).rstrip(b"\n") + b"\n")
+                    elif info.is_dir() or name.endswith("module-info.class") or name in entries or name in shadowed:
+                        # Merged modules would be one broken module; directories are implied by paths
+                        continue
+                    else:
+                        entries[name] = (jar, name)
+
+        manifest = "Manifest-Version: 1.0\r\nCreated-By: QuickMC\r\n"
+        if multi_release:
+            manifest += "Multi-Release: true\r\n"
+
+        os.makedirs(os.path.dirname(archive), exist_ok=True)
+        temp_path = f"{archive}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_STORED) as target:
+                target.writestr("META-INF/MANIFEST.MF", manifest + "\r\n")
+                for name, content in sorted(services.items()):
+                    target.writestr(name, b"".join(content))
+                self._copy_entries(target, entries)
+            os.replace(temp_path, archive)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @staticmethod
+    def _list_names(entry: str) -> List[str]:
+        """List the resource names a classpath entry (a jar or a class directory) provides."""
+        if os.path.isdir(entry):
+            return [
+                os.path.relpath(os.path.join(dirpath, filename), entry).replace(os.sep, "/")
+                for dirpath, _, filenames in os.walk(entry) for filename in filenames
+            ]
+        if os.path.isfile(entry):
+            with zipfile.ZipFile(entry) as jar:
+                return jar.namelist()
+        return []
+
+    @staticmethod
+    def _copy_entries(target: zipfile.ZipFile, entries: Dict[str, Tuple[str, str]]) -> None:
+        """Copy entries grouped by source jar, sorted by name so related classes sit together."""
+        by_jar: Dict[str, List[str]] = {}
+        for name, (jar, source_name) in entries.items():
+            by_jar.setdefault(jar, []).append(source_name)
+
+        for jar, names in by_jar.items():
+            with zipfile.ZipFile(jar) as source:
+                for name in sorted(names):
+                    target.writestr(zipfile.ZipInfo(name, source.getinfo(name).date_time), source.read(name))
+
+
+def summarize_classpath_modes(history: List[Dict[str, Any]], version: str) -> Optional[str]:
+    """Compare average startup time with the merged and the plain classpath for a version."""
+    times: Dict[str, List[float]] = {"merged": [], "plain": []}
+    for entry in history:
+        mode = entry.get("classpath")
+        if entry.get("version") == version and mode in times and entry.get("startup_seconds") is not None:
+            times[mode].append(entry["startup_seconds"])
+
+    if not times["merged"] or not times["plain"]:
+        return None
+    merged = sum(times["merged"]) / len(times["merged"])
+    plain = sum(times["plain"]) / len(times["plain"])
+    return (
+        f"Average startup: merged classpath {merged:.2f}s ({len(times['merged'])} launches), "
+        f"plain {plain:.2f}s ({len(times['plain'])} launches), {merged - plain:+.2f}s"
+    )
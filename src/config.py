@@ -1,10 +1,98 @@
 """Configuration management for QuickMC launcher."""
 
+import hashlib
 import json
 import os
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+import jsonc
 from exceptions import ConfigurationError
-from platform_utils import PlatformConfig
+from platform_utils import PlatformConfig, PlatformUtils
+
+MEMORY_SIZE = re.compile(r"\d+[KkMmGg]?")
+
+# Expected type for every known config key. Unknown keys are kept but warned about.
+CONFIG_SCHEMA: Dict[str, Any] = {
+    "minecraft_version": str,
+    "java": {
+        "executable_path": str,
+        "memory": {
+            "min": MEMORY_SIZE,
+            "max": MEMORY_SIZE
+        },
+        "jvm_arguments": [str]
+    },
+    "fabric": {
+        "auto_install": bool,
+        "loader_version": str,
+        "meta_url": str
+    },
+    "install": {
+        "download_threads": int,
+        "enable_progress_bar": bool,
+        "progress_output": str,
+        "progress_fps": (int, float),
+        "skip_hash_validation": bool,
+        "parallel_downloads": bool
+    },
+    "launch": {
+        "skip_asset_verification": bool,
+        "preload_natives": bool,
+        "close_launcher": bool,
+        "merged_classpath": bool,
+        "quick_join": [str],
+        "quick_join_timeout": (int, float),
+        "watchdog": bool,
+        "process": {
+            "cpu_affinity": [int],
+            "nice": int,
+            "ioprio_class": str,
+            "ioprio_level": int,
+            "launcher_nice": int,
+            "cgroup": {
+                "method": str,
+                "path": str,
+                "memory_max": str,
+                "cpu_quota": int
+            }
+        }
+    },
+    "network": {
+        "auth_deadline": (int, float),
+        "install_deadline": (int, float)
+    },
+    "profiling": {
+        "enabled": bool,
+        "mixin_verbose": bool,
+        "jfr": bool,
+        "end_marker": str,
+        "top": int
+    },
+    "cache": {
+        "peers": [str],
+        "peer_timeout": (int, float),
+        "serve_bind": str,
+        "serve_port": int
+    },
+    "daemon": {
+        "token_refresh_interval": (int, float),
+        "watch_interval": (int, float)
+    },
+    "fleet": {
+        "max_concurrent_startups": int,
+        "stagger_seconds": (int, float),
+        "startup_timeout": (int, float),
+        "startup_marker": str,
+        "username_prefix": str,
+        "memory": {
+            "min": MEMORY_SIZE,
+            "max": MEMORY_SIZE
+        }
+    }
+}
+
+SNAPSHOT_VERSION = 1
 
 
 class ConfigManager:
@@ -13,28 +101,52 @@ class ConfigManager:
     def __init__(self, data_dir: str):
         self.data_dir = data_dir
         self.config_path = os.path.join(data_dir, "config.json")
+        self.snapshot_path = os.path.join(data_dir, "config.snapshot.json")
         self._config: Optional[Dict[str, Any]] = None
+        self._warnings: List[str] = []
     
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from file with platform-aware fallback defaults."""
         if self._config is not None:
             return self._config
         
-        default_config = PlatformConfig.get_default_config()
-        
         # Ensure data directory exists
         os.makedirs(self.data_dir, exist_ok=True)
         
+        stat_key = self._get_stat_key()
+        defaults_hash = self._get_defaults_hash()
+        snapshot = self._load_snapshot(defaults_hash)
+        
+        # Warm start: the config file is unchanged, so skip parsing and detection entirely
+        if snapshot and snapshot["stat"] == stat_key and self._is_snapshot_usable(snapshot):
+            self._use_snapshot(snapshot)
+            return self._config
+        
+        content = self._read_user_config()
+        content_hash = hashlib.sha256(content).hexdigest() if content is not None else None
+        
+        # File was touched but not changed
+        if snapshot and snapshot["sha256"] == content_hash and self._is_snapshot_usable(snapshot):
+            self._use_snapshot(snapshot)
+            self._save_snapshot(self._config, stat_key, content_hash, defaults_hash)
+            return self._config
+        
+        default_config = PlatformConfig.get_default_config(resolve=False)
+        
         try:
-            user_config = self._load_user_config()
+            user_config = self._parse_user_config(content) if content is not None else None
             if user_config:
                 self._config = self._merge_configs(default_config, user_config)
             else:
                 self._config = default_config
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Warning: Could not load config.json from {self.config_path} ({e}), using platform defaults")
+        except json.JSONDecodeError as e:
+            self._warn(f"Could not load config.json from {self.config_path} ({e}), using platform defaults")
             self._config = default_config
         
+        # Only defaults the user did not override are computed
+        PlatformConfig.resolve_defaults(self._config)
+        self._save_snapshot(self._config, stat_key, content_hash, defaults_hash)
+        
         return self._config
     
     def save_config(self, config: Dict[str, Any]) -> None:
@@ -44,16 +156,154 @@ class ConfigManager:
             with open(self.config_path, "w") as f:
                 json.dump(config, f, indent=2)
             self._config = config
+            self._warnings = []
         except Exception as e:
             raise ConfigurationError(f"Failed to save config: {e}") from e
+        
+        with open(self.config_path, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        self._save_snapshot(config, self._get_stat_key(), content_hash, self._get_defaults_hash())
+    
+    def reload(self) -> Dict[str, Any]:
+        """Discard the in-memory config and load it again."""
+        self._config = None
+        return self.load_config()
     
-    def _load_user_config(self) -> Optional[Dict[str, Any]]:
-        """Load user configuration from file."""
-        if not os.path.exists(self.config_path):
+    def _read_user_config(self) -> Optional[bytes]:
+        """Read the raw user configuration file."""
+        try:
+            with open(self.config_path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
             return None
+    
+    def _parse_user_config(self, content: bytes) -> Optional[Dict[str, Any]]:
+        """Parse and validate the user configuration, dropping invalid keys with a warning."""
+        text = content.decode("utf-8-sig")
+        user_config, positions = jsonc.parse(text)
+        if not isinstance(user_config, dict):
+            raise jsonc.JSONCDecodeError("Config root must be an object", text, 0)
+        
+        errors = self._validate(user_config, CONFIG_SCHEMA, (), positions, text)
+        for line, message in sorted(errors, key=lambda error: error[0]):
+            self._warn(f"config.json line {line}: {message}")
         
-        with open(self.config_path, "r") as f:
-            return json.load(f)
+        return user_config
+    
+    def _warn(self, message: str) -> None:
+        """Print a config warning and remember it for the snapshot."""
+        print(f"Warning: {message}")
+        self._warnings.append(message)
+    
+    def _validate(self, value: Dict[str, Any], schema: Dict[str, Any], path: Tuple[Any, ...],
+                  positions: Dict[Tuple[Any, ...], int], text: str) -> List[Tuple[int, str]]:
+        """Validate a config section in place, removing invalid keys so their defaults apply."""
+        errors = []
+        for key in list(value):
+            key_path = path + (key,)
+            line = jsonc.line_of(text, positions.get(key_path, 0))
+            name = ".".join(str(part) for part in key_path)
+            
+            if key not in schema:
+                errors.append((line, f"unknown key '{name}'"))
+                continue
+            
+            expected = schema[key]
+            if isinstance(expected, dict):
+                if isinstance(value[key], dict):
+                    errors.extend(self._validate(value[key], expected, key_path, positions, text))
+                    continue
+                problem = "must be an object"
+            else:
+                problem = self._check_type(value[key], expected)
+                if problem is None:
+                    continue
+            
+            errors.append((line, f"'{name}' {problem}, using default"))
+            del value[key]
+        
+        return errors
+    
+    def _check_type(self, value: Any, expected: Any) -> Optional[str]:
+        """Check a single value against its schema entry and describe any problem."""
+        if isinstance(expected, list):
+            if not isinstance(value, list):
+                return "must be a list"
+            item_type = expected[0]
+            if any(self._check_type(item, item_type) for item in value):
+                return f"must only contain {item_type.__name__} values"
+            return None
+        
+        if isinstance(expected, re.Pattern):
+            if isinstance(value, str) and expected.fullmatch(value):
+                return None
+            return "must be a size such as \"4G\" or \"512M\""
+        
+        expected_types = expected if isinstance(expected, tuple) else (expected,)
+        # bool is a subclass of int, but true/false is never a valid number here
+        if not isinstance(value, expected_types) or (isinstance(value, bool) and bool not in expected_types):
+            return f"must be {' or '.join(t.__name__ for t in expected_types)}"
+        return None
+    
+    def _get_stat_key(self) -> Optional[List[int]]:
+        """Get the cheap change-detection key (mtime and size) of the config file."""
+        try:
+            stat = os.stat(self.config_path)
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+    
+    def _load_snapshot(self, defaults_hash: str) -> Optional[Dict[str, Any]]:
+        """Load the compiled config snapshot, if it matches this launcher, its defaults and the platform."""
+        try:
+            with open(self.snapshot_path, "r") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if (snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("system") != PlatformUtils.get_system()
+                or snapshot.get("defaults") != defaults_hash):
+            return None
+        return snapshot
+    
+    def _use_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Use a compiled snapshot, repeating the warnings found when it was compiled."""
+        self._config = snapshot["config"]
+        self._warnings = snapshot.get("warnings", [])
+        for message in self._warnings:
+            print(f"Warning: {message}")
+    
+    @staticmethod
+    def _get_defaults_hash() -> str:
+        """Hash the unresolved default config, so a launcher with new or changed defaults recompiles the snapshot."""
+        defaults = PlatformConfig.get_default_config(resolve=False)
+        encoded = json.dumps(defaults, sort_keys=True, default=lambda value: f"lazy:{value.factory.__qualname__}")
+        return hashlib.sha256(encoded.encode()).hexdigest()
+    
+    def _is_snapshot_usable(self, snapshot: Dict[str, Any]) -> bool:
+        """Check that values detected when the snapshot was compiled still hold."""
+        java_path = snapshot["config"].get("java", {}).get("executable_path", "")
+        return not os.path.isabs(java_path) or os.path.isfile(java_path)
+    
+    def _save_snapshot(self, config: Dict[str, Any], stat_key: Optional[List[int]], content_hash: Optional[str],
+                       defaults_hash: str) -> None:
+        """Save the merged config so the next startup can skip parsing and detection."""
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "system": PlatformUtils.get_system(),
+            "defaults": defaults_hash,
+            "stat": stat_key,
+            "sha256": content_hash,
+            "warnings": self._warnings,
+            "config": config
+        }
+        temp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Warning: Failed to save config snapshot: {e}")
     
     def _merge_configs(self, default: Dict[str, Any], user: Dict[str, Any]) -> Dict[str, Any]:
         """Recursively merge user config with defaults."""
@@ -0,0 +1,210 @@
+"""Resident launcher daemon that keeps launch state warm and answers launch requests instantly."""
+
+import json
+import os
+import socketserver
+import threading
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+
+from app import DEFAULT_INSTANCE, QuickMCApp
+from daemon_client import DaemonClient, SOCKET_NAME
+from exceptions import ConfigurationError, LaunchError, QuickMCError
+from installation import InstallationManager
+from launcher import MinecraftLauncher
+
+
+class LauncherDaemon:
+    """Keeps config, auth, the installed version and launch plans ready to spawn Minecraft."""
+
+    def __init__(self, app: QuickMCApp):
+        self.app = app
+        self.socket_path = os.path.join(app.data_dir, SOCKET_NAME)
+        self.instances_dir = app.instances_dir
+        self.daemon_config = app.config.get("daemon", {})
+
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._version: Optional[str] = None
+        self._login_data: Optional[Dict[str, Any]] = None
+        self._plans: Dict[str, List[str]] = {}
+        self._watch_signature: Optional[Tuple[Optional[int], Optional[int], FrozenSet[str]]] = None
+
+    def serve(self) -> None:
+        """Warm up all state and serve launch requests until stopped."""
+        if not DaemonClient.is_supported():
+            raise ConfigurationError("The launcher daemon requires Unix socket support")
+
+        self._claim_socket()
+
+        print("Warming up launcher daemon...")
+        self._login_data = self.app.auth_manager.authenticate()
+        print(f"Authenticated as: {self._login_data['name']}")
+        self._refresh_version()
+        self._get_plan(DEFAULT_INSTANCE)
+        self._watch_signature = self._get_watch_signature()
+
+        threading.Thread(target=self._token_loop, name="daemon-tokens", daemon=True).start()
+        threading.Thread(target=self._watch_loop, name="daemon-watch", daemon=True).start()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                try:
+                    response = daemon.handle_request(json.loads(line))
+                except ValueError as e:
+                    response = {"ok": False, "error": f"Invalid request: {e}"}
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self._server.daemon_threads = True
+        os.chmod(self.socket_path, 0o600)
+        print(f"Launcher daemon ready on {self.socket_path}")
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stop.set()
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print("Launcher daemon stopped")
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a single client request."""
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Invalid request: expected a JSON object"}
+        action = request.get("action")
+
+        if action == "status":
+            with self._lock:
+                return {"ok": True, "version": self._version, "instances": sorted(self._plans)}
+
+        if action == "launch":
+            instance = request.get("instance") or DEFAULT_INSTANCE
+            if not isinstance(instance, str):
+                return {"ok": False, "error": "Invalid request: instance must be a string"}
+            try:
+                return self.launch(instance)
+            except QuickMCError as e:
+                return {"ok": False, "error": str(e)}
+
+        if action == "stop":
+            # shutdown() blocks until serve_forever returns, so it cannot run on the handler thread
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return {"ok": True}
+
+        return {"ok": False, "error": f"Unknown action: {action}"}
+
+    def launch(self, instance: str) -> Dict[str, Any]:
+        """Spawn Minecraft for an instance from its precomputed launch plan, joining a quick-join server if set."""
+        game_dir = self.app.get_game_dir(instance)
+        server = self.app.pick_quick_join_server(self.app.start_quick_join())
+
+        with self._lock:
+            version = self._version
+            if server:
+                # The join options change with every pick, so this command is not kept as a plan
+                command = self.app.launcher.get_command(version, self._login_data, game_dir=game_dir, server=server)
+            else:
+                command = self._get_plan(instance)
+
+        try:
+            process = self.app.launcher.spawn_detached(command, cwd=game_dir, placement=self.app.launcher.placement)
+        except FileNotFoundError as e:
+            raise LaunchError(f"Java executable not found: {command[0]}") from e
+
+        print(f"Launched {instance} ({version}) as pid {process.pid}")
+        return {"ok": True, "pid": process.pid, "version": version, "server": server}
+
+    def _claim_socket(self) -> None:
+        """Remove a stale socket, refusing to start if another daemon is running."""
+        if not os.path.exists(self.socket_path):
+            return
+        if DaemonClient(self.app.data_dir, timeout=1.0).is_running():
+            raise ConfigurationError(f"A launcher daemon is already running on {self.socket_path}")
+        os.unlink(self.socket_path)
+
+    def _get_plan(self, instance: str) -> List[str]:
+        """Get the launch command for an instance, building it on first use."""
+        with self._lock:
+            if instance not in self._plans:
+                game_dir = self.app.get_game_dir(instance)
+                self._plans[instance] = self.app.launcher.get_command(self._version, self._login_data, game_dir=game_dir)
+            return self._plans[instance]
+
+    def _refresh_version(self) -> None:
+        """Resolve (and if needed install) the configured version, dropping stale plans."""
+        version = self.app.installation_manager.install_minecraft_version(self.app.config["minecraft_version"])
+        with self._lock:
+            self._version = version
+            self._plans.clear()
+
+    def _reload_config(self) -> None:
+        """Reload config and recreate the managers that depend on it."""
+        config = self.app.config_manager.reload()
+        with self._lock:
+            self.app.config = config
+            self.app.installation_manager = InstallationManager(self.app.minecraft_dir, config, self.app.data_dir)
+            self.app.launcher = MinecraftLauncher(self.app.minecraft_dir, config, self.app.data_dir)
+            self.daemon_config = config.get("daemon", {})
+
+    def _token_loop(self) -> None:
+        """Keep the cached login token fresh so launches never wait on auth."""
+        while not self._stop.wait(self.daemon_config.get("token_refresh_interval", 300)):
+            login_data = self.app.auth_manager.refresh_cached_login()
+            if login_data is None:
+                print("Warning: Cached login could not be refreshed, keeping the current token")
+                continue
+
+            with self._lock:
+                if login_data.get("access_token") != self._login_data.get("access_token"):
+                    self._login_data = login_data
+                    self._plans.clear()
+
+    def _watch_loop(self) -> None:
+        """Poll the config, installed versions and instance list and refresh what changed."""
+        while not self._stop.wait(self.daemon_config.get("watch_interval", 2)):
+            config_mtime, versions_mtime, instances = signature = self._get_watch_signature()
+            if signature == self._watch_signature:
+                continue
+
+            old_config_mtime, old_versions_mtime, old_instances = self._watch_signature
+            self._watch_signature = signature
+
+            # An instance only affects its own plan, through its game directory
+            if instances != old_instances:
+                with self._lock:
+                    for instance in old_instances - instances:
+                        self._plans.pop(instance, None)
+            if config_mtime == old_config_mtime and versions_mtime == old_versions_mtime:
+                continue
+
+            print("Detected config or version changes, refreshing launch state...")
+            try:
+                if config_mtime != old_config_mtime:
+                    self._reload_config()
+                self._refresh_version()
+            except Exception as e:
+                # Keep serving the last known-good state
+                print(f"Warning: Failed to refresh launch state: {e}")
+
+    def _get_watch_signature(self) -> Tuple[Optional[int], Optional[int], FrozenSet[str]]:
+        """Get what the launch state depends on: config and versions mtimes and the instances that exist.
+
+        Instance directories themselves are not stat'ed, the running game changes them constantly.
+        """
+        mtimes = []
+        for path in [self.app.config_manager.config_path, os.path.join(self.app.minecraft_dir, "versions")]:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                mtimes.append(None)
+
+        try:
+            instances = frozenset(entry.name for entry in os.scandir(self.instances_dir) if entry.is_dir())
+        except FileNotFoundError:
+            instances = frozenset()
+        return mtimes[0], mtimes[1], instances
@@ -0,0 +1,61 @@
+"""Thin client for the resident QuickMC launcher daemon.
+
+This module only uses the standard library so a launch request can be sent
+without loading the rest of the launcher.
+"""
+
+import json
+import os
+import socket
+from typing import Dict, Any, Optional
+
+SOCKET_NAME = "quickmc.sock"
+
+
+class DaemonClient:
+    """Sends requests to a running launcher daemon over its Unix socket."""
+
+    def __init__(self, data_dir: str, timeout: float = 5.0):
+        self.socket_path = os.path.join(data_dir, SOCKET_NAME)
+        self.timeout = timeout
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Check if the platform supports Unix sockets."""
+        return hasattr(socket, "AF_UNIX")
+
+    def is_running(self) -> bool:
+        """Check if a daemon is answering on the socket."""
+        try:
+            return self.request({"action": "status"}).get("ok", False)
+        except OSError:
+            return False
+
+    def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request and return the daemon's response."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("r", encoding="utf-8") as f:
+                line = f.readline()
+
+        if not line:
+            raise ConnectionError("Daemon closed the connection without answering")
+        return json.loads(line)
+
+    def try_launch(self, instance: str = "default") -> Optional[Dict[str, Any]]:
+        """Ask the daemon to launch an instance, returning None if no daemon is available."""
+        if not self.is_supported() or not os.path.exists(self.socket_path):
+            return None
+
+        try:
+            response = self.request({"action": "launch", "instance": instance})
+        except (OSError, ValueError) as e:
+            print(f"Launcher daemon unavailable ({e}), launching directly")
+            return None
+
+        if not response.get("ok"):
+            print(f"Launcher daemon could not launch {instance}: {response.get('error')}")
+            return None
+        return response
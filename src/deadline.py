@@ -0,0 +1,46 @@
+"""Time budgets for network calls on the launch path."""
+
+import threading
+from typing import Any, Callable, Dict, TypeVar
+
+from exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+# Calls still running past their deadline can be found by this thread name prefix
+THREAD_PREFIX = "deadline-"
+
+DEFAULT_DEADLINES = {
+    "auth": 5.0,
+    "install": 8.0
+}
+
+
+def get_deadline(config: Dict[str, Any], phase: str) -> float:
+    """Get the time budget in seconds for a launch phase."""
+    return float(config.get("network", {}).get(f"{phase}_deadline", DEFAULT_DEADLINES[phase]))
+
+
+def call_with_deadline(timeout: float, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a call in the background and give up waiting for it after the timeout.
+
+    The call itself keeps running after the deadline passes, so work such as
+    saving a refreshed token still completes in the background.
+    """
+    result: Dict[str, Any] = {}
+
+    def run() -> None:
+        try:
+            result["value"] = func(*args, **kwargs)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run, name=f"{THREAD_PREFIX}{getattr(func, '__name__', 'call')}", daemon=True)
+    thread.start()
+    thread.join(timeout)
+
+    if thread.is_alive():
+        raise DeadlineExceededError(f"{getattr(func, '__name__', 'Network call')} did not finish within {timeout:g}s")
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
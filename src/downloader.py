@@ -0,0 +1,98 @@
+"""Parallel, hash-verified file downloads for installs."""
+
+import hashlib
+import os
+import shutil
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from artifact_cache import ArtifactCache
+from exceptions import InstallationError
+from progress import ProgressBus
+
+USER_AGENT = "QuickMC"
+DOWNLOAD_TIMEOUT = 30
+
+
+class DownloadTask:
+    """A single file to download."""
+
+    def __init__(self, url: str, path: str, sha1: Optional[str] = None, size: Optional[int] = None):
+        self.url = url
+        self.path = path
+        self.sha1 = sha1
+        self.size = size
+
+
+def file_sha1(path: str) -> str:
+    """Calculate the SHA1 hash of a file."""
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1048576), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class ParallelDownloader:
+    """Downloads files on a thread pool, trying LAN peers before upstream."""
+
+    def __init__(self, threads: int = 4, artifact_cache: Optional[ArtifactCache] = None,
+                 progress: Optional[ProgressBus] = None, skip_hash_validation: bool = False):
+        self.threads = max(1, threads)
+        self.artifact_cache = artifact_cache
+        self.progress = progress
+        self.skip_hash_validation = skip_hash_validation
+
+    def download_all(self, tasks: List[DownloadTask], phase: str = "Downloading") -> None:
+        """Download every missing or outdated file, raising InstallationError if any download fails."""
+        if self.progress:
+            sizes = [task.size for task in tasks]
+            total_bytes = sum(sizes) if sizes and all(size is not None for size in sizes) else None
+            self.progress.start_phase(phase, total_items=len(tasks), total_bytes=total_bytes)
+
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="download") as executor:
+            futures = [executor.submit(self._download, task) for task in tasks]
+            errors = [future.exception() for future in futures if future.exception() is not None]
+
+        if errors:
+            raise InstallationError(f"{len(errors)} of {len(tasks)} downloads failed, first error: {errors[0]}")
+
+    def _download(self, task: DownloadTask) -> None:
+        if self._is_current(task):
+            # The phase total includes files that are already present, so they count towards the ETA too
+            nbytes = task.size or 0
+        else:
+            if not (self.artifact_cache and self.artifact_cache.fetch(task.sha1, task.path)):
+                self._download_upstream(task)
+            nbytes = os.path.getsize(task.path)
+
+        if task.sha1 and self.artifact_cache:
+            self.artifact_cache.store.record(task.sha1, task.path)
+        if self.progress:
+            self.progress.advance(1, nbytes)
+
+    def _is_current(self, task: DownloadTask) -> bool:
+        """Check if a file is already present with the expected content."""
+        if not os.path.isfile(task.path):
+            return False
+        if task.sha1 is None or self.skip_hash_validation:
+            return True
+        return file_sha1(task.path) == task.sha1
+
+    def _download_upstream(self, task: DownloadTask) -> None:
+        os.makedirs(os.path.dirname(task.path), exist_ok=True)
+        temp_path = f"{task.path}.{os.getpid()}.{threading.get_ident()}.part"
+        request = urllib.request.Request(task.url, headers={"User-Agent": USER_AGENT})
+
+        try:
+            with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response, open(temp_path, "wb") as f:
+                shutil.copyfileobj(response, f)
+            if task.sha1 and not self.skip_hash_validation and file_sha1(temp_path) != task.sha1:
+                raise InstallationError(f"Hash mismatch for {task.url}")
+            os.replace(temp_path, task.path)
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise InstallationError(f"Failed to download {task.url}: {e}") from e
@@ -29,3 +29,8 @@ class LaunchError(QuickMCError):
 class JavaNotFoundError(LaunchError):
     """Raised when Java executable cannot be found."""
     pass
+
+
+class DeadlineExceededError(QuickMCError):
+    """Raised when a network call does not finish within its time budget."""
+    pass
@@ -0,0 +1,33 @@
+"""Client for the Fabric meta API."""
+
+import json
+import urllib.parse
+import urllib.request
+from typing import Dict, Any, List
+
+DEFAULT_META_URL = "https://meta.fabricmc.net"
+META_TIMEOUT = 15
+
+
+class FabricMeta:
+    """Fetches loader versions and launcher profiles from Fabric meta (or a compatible stand-in)."""
+
+    def __init__(self, base_url: str = DEFAULT_META_URL):
+        self.base_url = base_url.rstrip("/")
+
+    def get_loader_versions(self) -> List[Dict[str, Any]]:
+        """Get all loader versions, newest first."""
+        return self._get_json("/v2/versions/loader")
+
+    def get_profile(self, minecraft_version: str, loader_version: str) -> Dict[str, Any]:
+        """Get the launcher profile (a complete version JSON) for a loader and Minecraft version."""
+        path = "/v2/versions/loader/{}/{}/profile/json".format(
+            urllib.parse.quote(minecraft_version, safe=""),
+            urllib.parse.quote(loader_version, safe="")
+        )
+        return self._get_json(path)
+
+    def _get_json(self, path: str) -> Any:
+        request = urllib.request.Request(self.base_url + path, headers={"User-Agent": "QuickMC"})
+        with urllib.request.urlopen(request, timeout=META_TIMEOUT) as response:
+            return json.load(response)
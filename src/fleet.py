@@ -0,0 +1,254 @@
+"""Fleet launch mode for starting many Minecraft clients at once (server load testing)."""
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional
+
+from exceptions import ConfigurationError
+from launcher import MinecraftLauncher
+
+
+class FleetClient:
+    """State of a single client in a fleet launch."""
+
+    def __init__(self, index: int, login_data: Dict[str, Any], game_dir: str):
+        self.index = index
+        self.login_data = login_data
+        self.game_dir = game_dir
+        self.state = "pending"
+        self.process: Optional[subprocess.Popen] = None
+        self.spawned_at: Optional[float] = None
+        self.startup_time: Optional[float] = None
+        self.exit_code: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def username(self) -> str:
+        """Get the client's username."""
+        return self.login_data["name"]
+
+
+class FleetLauncher:
+    """Launches N Minecraft clients concurrently with staggered, capped JVM startups."""
+
+    LOGIN_DATA_KEYS = ["name", "id", "access_token"]
+
+    def __init__(self, launcher: MinecraftLauncher, install_dir: str, config: Dict[str, Any]):
+        self.launcher = launcher
+        self.install_dir = install_dir
+        self.fleet_config = config.get("fleet", {})
+        self._stop = threading.Event()
+
+    @staticmethod
+    def offline_login_data(username: str) -> Dict[str, Any]:
+        """Build offline-mode login data, using the same UUID scheme as the vanilla server."""
+        digest = bytearray(hashlib.md5(f"OfflinePlayer:{username}".encode("utf-8")).digest())
+        digest[6] = (digest[6] & 0x0F) | 0x30
+        digest[8] = (digest[8] & 0x3F) | 0x80
+        return {
+            "name": username,
+            "id": uuid.UUID(bytes=bytes(digest)).hex,
+            "access_token": "0"
+        }
+
+    def build_accounts(self, count: int, accounts_path: Optional[str] = None,
+                       username_prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Build login data for each client from an accounts file or offline usernames."""
+        if accounts_path:
+            try:
+                with open(accounts_path, "r") as f:
+                    accounts = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                raise ConfigurationError(f"Failed to load fleet accounts from {accounts_path}: {e}") from e
+
+            if not isinstance(accounts, list):
+                raise ConfigurationError(f"Fleet accounts file {accounts_path} must contain a list")
+            login_data = [self._parse_account(account, i + 1, accounts_path) for i, account in enumerate(accounts)]
+            if len(login_data) < count:
+                raise ConfigurationError(f"Fleet needs {count} accounts but {accounts_path} has only {len(login_data)}")
+            return login_data[:count]
+
+        prefix = username_prefix or self.fleet_config.get("username_prefix", "QuickMC")
+        return [self.offline_login_data(f"{prefix}{i + 1}") for i in range(count)]
+
+    def _parse_account(self, account: Any, index: int, accounts_path: str) -> Dict[str, Any]:
+        """Turn an accounts file entry into login data, rejecting entries the launch would fail on."""
+        # Plain strings are offline-mode usernames, objects are full login data
+        if isinstance(account, str) and account:
+            return self.offline_login_data(account)
+        if isinstance(account, dict):
+            missing = [key for key in self.LOGIN_DATA_KEYS if not isinstance(account.get(key), str) or not account[key]]
+            if not missing:
+                return account
+            problem = f"is missing {', '.join(missing)}"
+        else:
+            problem = "must be a username or a login data object"
+        raise ConfigurationError(f"Fleet account {index} in {accounts_path} {problem}")
+
+    def run(self, version: str, accounts: List[Dict[str, Any]]) -> List[FleetClient]:
+        """Launch one client per account and wait until every client has exited."""
+        fleet_dir = os.path.join(self.install_dir, "fleet")
+        clients = [
+            FleetClient(i + 1, login_data, os.path.join(fleet_dir, login_data["name"]))
+            for i, login_data in enumerate(accounts)
+        ]
+
+        startup_slots = threading.Semaphore(max(1, int(self.fleet_config.get("max_concurrent_startups", 2))))
+        stagger = float(self.fleet_config.get("stagger_seconds", 5))
+
+        threads = [
+            threading.Thread(
+                target=self._run_client,
+                args=(client, version, startup_slots, client_index * stagger),
+                name=f"fleet-{client.username}",
+                daemon=True
+            )
+            for client_index, client in enumerate(clients)
+        ]
+
+        print(f"Launching fleet of {len(clients)} clients...")
+        for thread in threads:
+            thread.start()
+
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            print("\nStopping fleet...")
+            self.stop(clients)
+            for thread in threads:
+                thread.join(10)
+
+        return clients
+
+    def stop(self, clients: List[FleetClient]) -> None:
+        """Terminate every running client."""
+        self._stop.set()
+        for client in clients:
+            if client.process and client.process.poll() is None:
+                client.process.terminate()
+
+    def _run_client(self, client: FleetClient, version: str, startup_slots: threading.Semaphore, delay: float) -> None:
+        """Run a single client through its whole lifecycle."""
+        if self._stop.wait(delay):
+            client.state = "cancelled"
+            return
+
+        with startup_slots:
+            if self._stop.is_set():
+                client.state = "cancelled"
+                return
+            try:
+                self._spawn_client(client, version)
+            except Exception as e:
+                client.state = "failed"
+                client.error = str(e)
+                print(f"[{client.username}] Failed to launch: {e}")
+                return
+            self._wait_for_startup(client)
+
+        # Keep draining output so the client never blocks on a full pipe
+        for _ in client.process.stdout:
+            pass
+        client.exit_code = client.process.wait()
+        if client.state != "failed":
+            client.state = "exited"
+        print(f"[{client.username}] Exited with code {client.exit_code}")
+
+    def _spawn_client(self, client: FleetClient, version: str) -> None:
+        """Prepare the client's game directory and start its JVM."""
+        os.makedirs(client.game_dir, exist_ok=True)
+        self._link_shared_dir(client.game_dir, "mods")
+
+        memory = self.fleet_config.get("memory")
+        command = self.launcher.get_command(
+            version, client.login_data, game_dir=client.game_dir, memory=memory, recording_tag=f"client{client.index}"
+        )
+
+        client.state = "starting"
+        client.spawned_at = time.monotonic()
+        client.process = self.launcher.spawn(command, cwd=client.game_dir, capture_output=True)
+        print(f"[{client.username}] Started (pid {client.process.pid})")
+
+    def _wait_for_startup(self, client: FleetClient) -> None:
+        """Block until the client reaches the main menu, exits or times out."""
+        marker = self.fleet_config.get("startup_marker", "Sound engine started")
+        timeout = float(self.fleet_config.get("startup_timeout", 180))
+
+        # readline() blocks, so the timeout is enforced by killing a hung client
+        timer = threading.Timer(timeout, self._startup_timed_out, args=(client,))
+        timer.daemon = True
+        timer.start()
+        try:
+            for line in client.process.stdout:
+                if marker in line:
+                    client.startup_time = time.monotonic() - client.spawned_at
+                    client.state = "running"
+                    print(f"[{client.username}] Reached main menu in {client.startup_time:.1f}s")
+                    return
+        finally:
+            timer.cancel()
+
+        if client.state == "starting":
+            client.state = "failed"
+            client.error = "exited during startup"
+
+    def _startup_timed_out(self, client: FleetClient) -> None:
+        """Kill a client that did not finish starting within the timeout."""
+        if client.state == "starting" and client.process.poll() is None:
+            client.state = "failed"
+            client.error = "startup timed out"
+            print(f"[{client.username}] Startup timed out, terminating")
+            client.process.terminate()
+
+    def _link_shared_dir(self, game_dir: str, name: str) -> None:
+        """Share a directory (such as mods) from the main game directory with a client."""
+        source = os.path.join(self.launcher.minecraft_dir, name)
+        target = os.path.join(game_dir, name)
+        if not os.path.isdir(source) or os.path.lexists(target):
+            return
+        try:
+            os.symlink(source, target, target_is_directory=True)
+        except OSError as e:
+            print(f"Warning: Could not link {name} into {game_dir}: {e}")
+
+    @staticmethod
+    def print_summary(clients: List[FleetClient]) -> None:
+        """Print a summary table of every client's lifecycle and startup time."""
+        headers = ["#", "Username", "PID", "State", "Startup (s)", "Exit code", "Error"]
+        rows = [
+            [
+                str(client.index),
+                client.username,
+                str(client.process.pid) if client.process else "-",
+                client.state,
+                f"{client.startup_time:.1f}" if client.startup_time is not None else "-",
+                str(client.exit_code) if client.exit_code is not None else "-",
+                client.error or ""
+            ]
+            for client in clients
+        ]
+
+        widths = [max(len(row[i]) for row in [headers] + rows) for i in range(len(headers))]
+        print()
+        print("  ".join(h.ljust(w) for h, w in zip(headers, widths)).rstrip())
+        print("  ".join("-" * w for w in widths))
+        for row in rows:
+            print("  ".join(c.ljust(w) for c, w in zip(row, widths)).rstrip())
+
+        startup_times = [c.startup_time for c in clients if c.startup_time is not None]
+        if startup_times:
+            print(
+                f"\n{len(startup_times)}/{len(clients)} clients started, "
+                f"startup min {min(startup_times):.1f}s / "
+                f"avg {sum(startup_times) / len(startup_times):.1f}s / "
+                f"max {max(startup_times):.1f}s"
+            )
+        else:
+            print(f"\n0/{len(clients)} clients started")
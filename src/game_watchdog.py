@@ -0,0 +1,72 @@
+"""Minimal process that watches the running game after the launcher hands off to it.
+
+Only the standard library is used here, so the launcher's modules, minecraft_launcher_lib and any
+GUI toolkit are gone from memory for the rest of the session.
+"""
+
+import os
+import sys
+from typing import List, Optional
+
+WATCHDOG_COMMAND = "__watchdog"
+
+
+def resident_memory_kb() -> Optional[int]:
+    """Get this process's resident memory in KB, where the platform exposes it."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def watchdog_command() -> List[str]:
+    """Get the command that starts the watchdog: the compiled launcher itself, or this file without site imports."""
+    if "__compiled__" in globals():
+        return [sys.executable, WATCHDOG_COMMAND]
+    return [sys.executable, "-S", os.path.abspath(__file__)]
+
+
+def watch(pid: int, fd: int, log_path: str, launcher_rss: int) -> int:
+    """Copy the game's output to the terminal and its log until it exits, then return its exit code."""
+    rss = resident_memory_kb()
+    if launcher_rss and rss:
+        print(
+            f"Launcher handed off to watchdog: {launcher_rss / 1024:.1f} MB -> {rss / 1024:.1f} MB resident "
+            f"({(launcher_rss - rss) / 1024:.1f} MB freed for the game)",
+            flush=True
+        )
+
+    try:
+        with open(log_path, "ab") as log:
+            while True:
+                data = os.read(fd, 65536)
+                if not data:
+                    break
+                sys.stdout.buffer.write(data)
+                sys.stdout.buffer.flush()
+                log.write(data)
+    except KeyboardInterrupt:
+        print("\nLauncher interrupted by user.")
+        return 1
+    finally:
+        os.close(fd)
+
+    _, status = os.waitpid(pid, 0)
+    exit_code = os.waitstatus_to_exitcode(status)
+    if exit_code:
+        print(f"Minecraft exited with code {exit_code}")
+    return exit_code
+
+
+def main(argv: List[str]) -> None:
+    """Run the watchdog with the arguments the launcher passes when it hands off."""
+    pid, fd, log_path, launcher_rss = argv
+    sys.exit(watch(int(pid), int(fd), log_path, int(launcher_rss)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,175 @@
+"""Reference-counted garbage collection of unused versions, libraries, assets and runtimes."""
+
+import json
+import os
+import shutil
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from exceptions import InstallationError
+from version_data import library_paths, load_version_chain
+
+
+class GarbageCollector:
+    """Finds files that no version in use references and removes or archives them."""
+
+    CATEGORIES = ["versions", "libraries", "asset objects", "asset indexes", "runtimes"]
+
+    def __init__(self, minecraft_dir: str):
+        self.minecraft_dir = minecraft_dir
+
+    def collect(self, roots: Iterable[str], delete: bool = False, archive_dir: Optional[str] = None) -> int:
+        """Report (and optionally delete or archive) everything unreachable from the root versions.
+
+        Returns the number of bytes that were (or, in a dry run, could be) reclaimed.
+        """
+        reachable = self._build_reachable_set(roots)
+        unreachable = self._find_unreachable(reachable)
+        reclaimable = self._print_report(reachable, unreachable)
+
+        if not delete and archive_dir is None:
+            print("\nDry run, nothing was removed. Use --delete or --archive DIR to reclaim space.")
+            return reclaimable
+
+        for paths in unreachable.values():
+            for path, _ in paths:
+                if archive_dir is not None:
+                    target = os.path.join(archive_dir, os.path.relpath(path, self.minecraft_dir))
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.move(path, target)
+                elif os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+
+        for directory in ["libraries", os.path.join("assets", "objects")]:
+            self._remove_empty_dirs(os.path.join(self.minecraft_dir, directory))
+
+        action = f"Archived to {archive_dir}" if archive_dir is not None else "Removed"
+        print(f"\n{action}: {self._format_size(reclaimable)}")
+        return reclaimable
+
+    def _build_reachable_set(self, roots: Iterable[str]) -> Dict[str, Counter]:
+        """Count how many versions in use reference each file."""
+        reachable = {category: Counter() for category in self.CATEGORIES}
+
+        for root in roots:
+            try:
+                chain = load_version_chain(self.minecraft_dir, root)
+            except FileNotFoundError as e:
+                # Collecting with an incomplete root set would delete files that are still needed
+                raise InstallationError(f"Cannot collect garbage: {e}") from e
+
+            for data in chain:
+                reachable["versions"][data["id"]] += 1
+                for library in data.get("libraries", []):
+                    for path in library_paths(library):
+                        reachable["libraries"][os.path.normpath(path)] += 1
+
+                if "assetIndex" in data:
+                    index_id = data["assetIndex"]["id"]
+                    reachable["asset indexes"][index_id] += 1
+                    for object_hash in self._load_asset_hashes(index_id):
+                        reachable["asset objects"][object_hash] += 1
+
+                if "javaVersion" in data:
+                    reachable["runtimes"][data["javaVersion"]["component"]] += 1
+
+        if not reachable["versions"]:
+            raise InstallationError("Cannot collect garbage: no versions in use were found")
+        return reachable
+
+    def _load_asset_hashes(self, index_id: str) -> List[str]:
+        """Get the objects an asset index refers to, refusing to continue if it cannot be read."""
+        path = os.path.join(self.minecraft_dir, "assets", "indexes", f"{index_id}.json")
+        try:
+            with open(path, "r") as f:
+                return [entry["hash"] for entry in json.load(f)["objects"].values()]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            # Without the index every object it lists would look unreachable
+            raise InstallationError(f"Cannot collect garbage: asset index {index_id} is missing or unreadable ({e})") from e
+
+    def _find_unreachable(self, reachable: Dict[str, Counter]) -> Dict[str, List[Tuple[str, int]]]:
+        """List unreachable files and directories with their sizes, per category."""
+        unreachable: Dict[str, List[Tuple[str, int]]] = {category: [] for category in self.CATEGORIES}
+
+        versions_dir = os.path.join(self.minecraft_dir, "versions")
+        for entry in self._scan(versions_dir):
+            if entry.is_dir() and entry.name not in reachable["versions"]:
+                unreachable["versions"].append((entry.path, self._size_of(entry.path)))
+
+        libraries_dir = os.path.join(self.minecraft_dir, "libraries")
+        for dirpath, _, filenames in os.walk(libraries_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if os.path.relpath(path, libraries_dir) not in reachable["libraries"]:
+                    unreachable["libraries"].append((path, os.path.getsize(path)))
+
+        objects_dir = os.path.join(self.minecraft_dir, "assets", "objects")
+        for prefix in self._scan(objects_dir):
+            for entry in self._scan(prefix.path):
+                if entry.name not in reachable["asset objects"]:
+                    unreachable["asset objects"].append((entry.path, entry.stat().st_size))
+
+        indexes_dir = os.path.join(self.minecraft_dir, "assets", "indexes")
+        for entry in self._scan(indexes_dir):
+            if entry.name.endswith(".json") and entry.name[:-5] not in reachable["asset indexes"]:
+                unreachable["asset indexes"].append((entry.path, entry.stat().st_size))
+
+        runtime_dir = os.path.join(self.minecraft_dir, "runtime")
+        for entry in self._scan(runtime_dir):
+            if entry.is_dir() and entry.name not in reachable["runtimes"]:
+                unreachable["runtimes"].append((entry.path, self._size_of(entry.path)))
+
+        return unreachable
+
+    def _print_report(self, reachable: Dict[str, Counter], unreachable: Dict[str, List[Tuple[str, int]]]) -> int:
+        print(f"Versions in use: {', '.join(sorted(reachable['versions']))}")
+        print(f"\n  {'Category':<16} {'In use':>8} {'Shared':>8} {'Unused':>8} {'Reclaimable':>12}")
+
+        total = 0
+        for category in self.CATEGORIES:
+            counts = reachable[category]
+            shared = sum(1 for count in counts.values() if count > 1)
+            size = sum(size for _, size in unreachable[category])
+            total += size
+            print(
+                f"  {category:<16} {len(counts):>8} {shared:>8} "
+                f"{len(unreachable[category]):>8} {self._format_size(size):>12}"
+            )
+        print(f"\n  Total reclaimable: {self._format_size(total)}")
+        return total
+
+    @staticmethod
+    def _scan(path: str) -> List[os.DirEntry]:
+        try:
+            return list(os.scandir(path))
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def _size_of(path: str) -> int:
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    pass
+        return total
+
+    @staticmethod
+    def _remove_empty_dirs(root: str) -> None:
+        for dirpath, _, _ in sorted(os.walk(root), key=lambda walk: len(walk[0]), reverse=True):
+            if dirpath != root and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+    @staticmethod
+    def _format_size(size: float) -> str:
+        if size < 1024:
+            return f"{size:.0f} B"
+        for unit in ["KB", "MB"]:
+            size /= 1024
+            if size < 1024:
+                return f"{size:.1f} {unit}"
+        return f"{size / 1024:.1f} GB"
@@ -0,0 +1,250 @@
+"""Critical-path-first installation of vanilla Minecraft versions."""
+
+import hashlib
+import json
+import os
+import threading
+import urllib.request
+from typing import Dict, Any, List, Optional
+
+from minecraft_launcher_lib._helper import parse_rule_list
+from minecraft_launcher_lib.natives import extract_natives_file, get_natives
+from minecraft_launcher_lib.runtime import install_jvm_runtime
+
+from artifact_cache import ArtifactCache
+from downloader import USER_AGENT, DOWNLOAD_TIMEOUT, DownloadTask, ParallelDownloader
+from exceptions import InstallationError
+from progress import ProgressBus
+from version_data import load_version_json, maven_path, version_json_path
+
+VERSION_MANIFEST_URL = "https://piston-meta.mojang.com/mc/game/version_manifest_v2.json"
+LIBRARIES_URL = "https://libraries.minecraft.net"
+RESOURCES_URL = "https://resources.download.minecraft.net"
+DEFERRED_FILE = "quickmc-deferred.json"
+# Assets the game reaches the main menu without; a missing sound or language is only noticed when it is used
+DEFERRABLE_ASSET_PREFIXES = ("minecraft/sounds/", "minecraft/lang/", "realms/lang/")
+
+
+class InstallPlan:
+    """The files a version needs, split into what it needs to boot and what can arrive later."""
+
+    def __init__(self):
+        self.critical: List[DownloadTask] = []
+        self.deferred: List[DownloadTask] = []
+        self.natives: List[DownloadTask] = []
+        self.native_extract: Dict[str, Dict[str, Any]] = {}
+
+
+class InstallPlanner:
+    """Installs a version's boot-critical files first and streams the rest in the background."""
+
+    def __init__(self, minecraft_dir: str, artifact_cache: Optional[ArtifactCache] = None,
+                 threads: int = 4, skip_hash_validation: bool = False):
+        self.minecraft_dir = minecraft_dir
+        self.artifact_cache = artifact_cache
+        self.threads = threads
+        self.skip_hash_validation = skip_hash_validation
+        self._deferred_threads: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def install(self, version_id: str, progress: Optional[ProgressBus] = None) -> None:
+        """Install everything the version needs to start, then continue with the rest in the background."""
+        version_data = load_version_json(self.minecraft_dir, version_id)
+        version_json = None
+        if version_data is None:
+            version_json = self._fetch_version_json(version_id)
+            version_data = json.loads(version_json)
+
+        downloader = ParallelDownloader(self.threads, self.artifact_cache, progress, self.skip_hash_validation)
+        # The asset index decides which assets are critical, so it has to be there before planning
+        downloader.download_all(self._get_asset_index_tasks(version_data), "Downloading asset index")
+        plan = self.plan(version_data)
+        downloader.download_all(plan.critical + plan.natives, "Downloading game files")
+        self._extract_natives(version_id, plan)
+
+        runtime = version_data.get("javaVersion", {}).get("component")
+        if plan.deferred or runtime:
+            self._write_deferred(version_id, plan.deferred, runtime)
+
+        # The version JSON is written last so an interrupted install is never treated as installed
+        if version_json is not None:
+            path = version_json_path(self.minecraft_dir, version_id)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(version_json)
+            os.replace(path + ".tmp", path)
+
+        self.resume_deferred(version_id)
+
+    def plan(self, version_data: Dict[str, Any]) -> InstallPlan:
+        """Classify every file of a version as critical or deferrable."""
+        plan = InstallPlan()
+        version_id = version_data["id"]
+
+        client = version_data.get("downloads", {}).get("client")
+        if client:
+            plan.critical.append(DownloadTask(
+                client["url"],
+                os.path.join(self.minecraft_dir, "versions", version_id, f"{version_id}.jar"),
+                client.get("sha1"),
+                client.get("size")
+            ))
+
+        logging_file = version_data.get("logging", {}).get("client", {}).get("file")
+        if logging_file:
+            plan.critical.append(DownloadTask(
+                logging_file["url"],
+                os.path.join(self.minecraft_dir, "assets", "log_configs", logging_file["id"]),
+                logging_file.get("sha1"),
+                logging_file.get("size")
+            ))
+
+        for library in version_data.get("libraries", []):
+            self._plan_library(library, plan)
+
+        for name, entry in self._load_asset_objects(version_data).items():
+            object_hash = entry["hash"]
+            task = DownloadTask(
+                f"{RESOURCES_URL}/{object_hash[:2]}/{object_hash}",
+                os.path.join(self.minecraft_dir, "assets", "objects", object_hash[:2], object_hash),
+                object_hash,
+                entry.get("size")
+            )
+            (plan.deferred if name.startswith(DEFERRABLE_ASSET_PREFIXES) else plan.critical).append(task)
+
+        plan.critical = self._unique(plan.critical)
+        critical_paths = {task.path for task in plan.critical}
+        plan.deferred = [task for task in self._unique(plan.deferred) if task.path not in critical_paths]
+        return plan
+
+    def resume_deferred(self, version_id: str) -> Optional[threading.Thread]:
+        """Continue downloading a version's deferred files in the background, if any are left."""
+        deferred_path = os.path.join(self.minecraft_dir, "versions", version_id, DEFERRED_FILE)
+        with self._lock:
+            thread = self._deferred_threads.get(version_id)
+            if thread is not None and thread.is_alive():
+                return thread
+            try:
+                with open(deferred_path, "r") as f:
+                    deferred = json.load(f)
+            except (OSError, ValueError):
+                return None
+
+            tasks = [DownloadTask(*task) for task in deferred.get("tasks", [])]
+            print(f"Downloading {len(tasks)} remaining files for {version_id} in the background")
+            # Not a daemon thread, so a detached launch keeps the launcher alive until the files are in
+            thread = threading.Thread(
+                target=self._download_deferred,
+                args=(deferred_path, tasks, deferred.get("runtime")),
+                name=f"deferred-{version_id}"
+            )
+            self._deferred_threads[version_id] = thread
+            thread.start()
+            return thread
+
+    def _download_deferred(self, deferred_path: str, tasks: List[DownloadTask], runtime: Optional[str]) -> None:
+        try:
+            ParallelDownloader(self.threads, self.artifact_cache, None, self.skip_hash_validation).download_all(tasks)
+            if runtime:
+                # QuickMC launches with the configured Java, so the bundled runtime is never on the critical path
+                install_jvm_runtime(runtime, self.minecraft_dir)
+            os.remove(deferred_path)
+        except Exception as e:
+            print(f"Warning: Background download failed, it will be retried on the next launch: {e}")
+        finally:
+            if self.artifact_cache:
+                self.artifact_cache.store.save()
+
+    def _plan_library(self, library: Dict[str, Any], plan: InstallPlan) -> None:
+        if "rules" in library and not parse_rule_list(library["rules"], {}):
+            return
+
+        libraries_dir = os.path.join(self.minecraft_dir, "libraries")
+        downloads = library.get("downloads")
+        if downloads is None:
+            path = maven_path(library["name"])
+            url = library.get("url", LIBRARIES_URL).rstrip("/") + "/" + path
+            plan.critical.append(DownloadTask(url, os.path.join(libraries_dir, *path.split("/"))))
+            return
+
+        artifact = downloads.get("artifact")
+        if artifact and artifact.get("url") and artifact.get("path"):
+            plan.critical.append(DownloadTask(
+                artifact["url"],
+                os.path.join(libraries_dir, *artifact["path"].split("/")),
+                artifact.get("sha1"),
+                artifact.get("size")
+            ))
+
+        native = get_natives(library)
+        classifier = downloads.get("classifiers", {}).get(native) if native else None
+        if classifier:
+            task = DownloadTask(
+                classifier["url"],
+                os.path.join(libraries_dir, *classifier["path"].split("/")),
+                classifier.get("sha1"),
+                classifier.get("size")
+            )
+            plan.natives.append(task)
+            plan.native_extract[task.path] = library.get("extract", {"exclude": []})
+
+    def _get_asset_index_tasks(self, version_data: Dict[str, Any]) -> List[DownloadTask]:
+        asset_index = version_data.get("assetIndex")
+        if not asset_index:
+            return []
+        return [DownloadTask(
+            asset_index["url"],
+            os.path.join(self.minecraft_dir, "assets", "indexes", f"{asset_index['id']}.json"),
+            asset_index.get("sha1"),
+            asset_index.get("size")
+        )]
+
+    def _load_asset_objects(self, version_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        if "assetIndex" not in version_data:
+            return {}
+        path = os.path.join(self.minecraft_dir, "assets", "indexes", f"{version_data['assetIndex']['id']}.json")
+        with open(path, "r") as f:
+            return json.load(f)["objects"]
+
+    def _extract_natives(self, version_id: str, plan: InstallPlan) -> None:
+        natives_dir = os.path.join(self.minecraft_dir, "versions", version_id, "natives")
+        for task in plan.natives:
+            os.makedirs(natives_dir, exist_ok=True)
+            extract_natives_file(task.path, natives_dir, plan.native_extract[task.path])
+
+    def _write_deferred(self, version_id: str, tasks: List[DownloadTask], runtime: Optional[str]) -> None:
+        path = os.path.join(self.minecraft_dir, "versions", version_id, DEFERRED_FILE)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "runtime": runtime,
+                "tasks": [[task.url, task.path, task.sha1, task.size] for task in tasks]
+            }, f)
+
+    def _fetch_version_json(self, version_id: str) -> bytes:
+        """Download a version's JSON from the version manifest, verifying its hash."""
+        manifest = json.loads(self._get(VERSION_MANIFEST_URL))
+        for entry in manifest["versions"]:
+            if entry["id"] == version_id:
+                data = self._get(entry["url"])
+                if entry.get("sha1") and hashlib.sha1(data).hexdigest() != entry["sha1"]:
+                    raise InstallationError(f"Hash mismatch for the {version_id} version JSON")
+                return data
+        raise InstallationError(f"Minecraft version {version_id} does not exist")
+
+    @staticmethod
+    def _get(url: str) -> bytes:
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+            return response.read()
+
+    @staticmethod
+    def _unique(tasks: List[DownloadTask]) -> List[DownloadTask]:
+        """Drop tasks for a path that is already planned (assets share objects between names)."""
+        seen = set()
+        unique = []
+        for task in tasks:
+            if task.path not in seen:
+                seen.add(task.path)
+                unique.append(task)
+        return unique
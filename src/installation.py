@@ -1,36 +1,90 @@
 """Minecraft installation management."""
 
+import json
 import os
-from typing import Dict, Any, Optional, Callable
-import minecraft_launcher_lib as mcl
-from tqdm import tqdm
+from typing import Dict, Any, List, Optional
 
+from artifact_cache import ArtifactCache
+from deadline import call_with_deadline, get_deadline
+from downloader import DownloadTask, ParallelDownloader
 from exceptions import InstallationError
+from fabric_meta import DEFAULT_META_URL, FabricMeta
+from install_planner import InstallPlanner
+from progress import ProgressBus
+from version_data import maven_path, version_json_path
+
+FABRIC_MAVEN_URL = "https://maven.fabricmc.net/"
 
 
 class InstallationManager:
     """Manages Minecraft and Fabric installation."""
     
-    def __init__(self, minecraft_dir: str, config: Dict[str, Any]):
+    def __init__(self, minecraft_dir: str, config: Dict[str, Any], data_dir: Optional[str] = None):
         self.minecraft_dir = minecraft_dir
         self.config = config
-        self._progress_bar: Optional[tqdm] = None
+        self.deadline = get_deadline(config, "install")
+        self.artifact_cache = ArtifactCache(minecraft_dir, data_dir, config) if data_dir else None
+        self.fabric_meta = FabricMeta(config["fabric"].get("meta_url", DEFAULT_META_URL))
+        self.planner = InstallPlanner(
+            minecraft_dir,
+            self.artifact_cache,
+            self._get_download_threads(),
+            config["install"].get("skip_hash_validation", False)
+        )
     
     def install_minecraft_version(self, version: str) -> str:
         """Install Minecraft version and return the actual version string to use."""
-        # Handle Fabric installation if configured
-        if self.config["fabric"]["auto_install"]:
-            return self._install_fabric_version(version)
-        else:
-            # Use vanilla Minecraft - just ensure it's installed
-            self._ensure_minecraft_installed(version)
-            return version
+        if self.artifact_cache:
+            self.artifact_cache.install_download_hook()
+        
+        try:
+            # Finish files a previous launch deferred while this one starts
+            self.planner.resume_deferred(version)
+            
+            # Handle Fabric installation if configured
+            if self.config["fabric"]["auto_install"]:
+                return self._install_fabric_version(version)
+            else:
+                # Use vanilla Minecraft - just ensure it's installed
+                self._ensure_minecraft_installed(version)
+                return version
+        finally:
+            if self.artifact_cache:
+                self.artifact_cache.store.save()
+    
+    def resolve_installed_version(self, version: str) -> Optional[str]:
+        """Get the installed version that a launch of this Minecraft version would use, without any network."""
+        if not self.config["fabric"]["auto_install"]:
+            return version if self._is_version_installed(version) else None
+        
+        config_version = self.config["fabric"]["loader_version"]
+        if config_version != "latest":
+            version_id = f"fabric-loader-{config_version}-{version}"
+            if self._is_version_installed(version_id):
+                return version_id
+        return self._find_installed_fabric_version(version)
     
     def _install_fabric_version(self, minecraft_version: str) -> str:
         """Install Fabric loader for the specified Minecraft version."""
         try:
-            # Get fabric loader version
-            fabric_versions = mcl.fabric.get_all_loader_versions()
+            # A pinned loader that is already installed needs no network at all
+            config_version = self.config["fabric"]["loader_version"]
+            if config_version != "latest":
+                version_id = f"fabric-loader-{config_version}-{minecraft_version}"
+                if self._is_version_installed(version_id):
+                    print(f"Fabric {version_id} is already installed")
+                    return version_id
+            
+            # Get fabric loader version, falling back to an installed loader if the network is slow or down
+            try:
+                fabric_versions = call_with_deadline(self.deadline, self.fabric_meta.get_loader_versions)
+            except Exception as e:
+                installed_version = self._find_installed_fabric_version(minecraft_version)
+                if installed_version is None:
+                    raise
+                print(f"Could not check Fabric loader versions ({e}), using installed {installed_version}")
+                return installed_version
+            
             if not fabric_versions:
                 raise InstallationError("No Fabric loader versions available")
             
@@ -67,71 +121,89 @@ class InstallationManager:
         print(f"Warning: Fabric version {config_version} not found, using latest")
         return fabric_versions[0]["version"]
     
+    def _find_installed_fabric_version(self, minecraft_version: str) -> Optional[str]:
+        """Find the most recently installed Fabric loader for a Minecraft version."""
+        versions_dir = os.path.join(self.minecraft_dir, "versions")
+        if not os.path.isdir(versions_dir):
+            return None
+        
+        candidates = []
+        for entry in os.scandir(versions_dir):
+            version_json = os.path.join(entry.path, f"{entry.name}.json")
+            if (entry.name.startswith("fabric-loader-") and entry.name.endswith(f"-{minecraft_version}")
+                    and os.path.isfile(version_json)):
+                candidates.append((os.path.getmtime(version_json), entry.name))
+        
+        return max(candidates)[1] if candidates else None
+    
     def _is_version_installed(self, version_id: str) -> bool:
         """Check if a Minecraft version is already installed."""
-        installed_versions = mcl.utils.get_installed_versions(self.minecraft_dir)
-        return any(v["id"] == version_id for v in installed_versions)
+        return os.path.isfile(version_json_path(self.minecraft_dir, version_id))
     
     def _ensure_minecraft_installed(self, version: str) -> None:
         """Ensure vanilla Minecraft version is installed."""
         if not self._is_version_installed(version):
             print(f"Installing Minecraft {version}...")
-            # The installation will happen automatically when launching
-            # This is a placeholder for potential future vanilla installation logic
+            progress = ProgressBus.from_config(self.config)
+            try:
+                self.planner.install(version, progress)
+            except Exception as e:
+                raise InstallationError(f"Minecraft installation failed: {e}")
+            finally:
+                progress.close()
     
     def _install_fabric(self, minecraft_version: str, fabric_version: str) -> None:
-        """Install Fabric with progress tracking."""
-        callback = self._create_progress_callback()
-        install_options = self._get_install_options()
+        """Install Fabric by writing its profile from Fabric meta, without running the Fabric installer."""
+        progress = ProgressBus.from_config(self.config)
+        skip_hash_validation = self.config["install"].get("skip_hash_validation", False)
+        if skip_hash_validation:
+            print("Warning: Hash validation disabled for faster installation")
         
         try:
-            mcl.fabric.install_fabric(
-                minecraft_version,
-                self.minecraft_dir,
-                callback=callback,
-                **install_options
+            # Fabric inherits the vanilla version, so its boot-critical files have to be installed first
+            if not self._is_version_installed(minecraft_version):
+                self.planner.install(minecraft_version, progress)
+            
+            profile = self.fabric_meta.get_profile(minecraft_version, fabric_version)
+            
+            downloader = ParallelDownloader(
+                self._get_download_threads(),
+                self.artifact_cache,
+                progress,
+                skip_hash_validation
             )
+            downloader.download_all(self._get_library_tasks(profile), "Downloading Fabric libraries")
             
-            if self._progress_bar:
-                self._progress_bar.close()
-                self._progress_bar = None
-                
+            # The version JSON is written last so an interrupted install is never treated as installed
+            self._write_version_json(profile)
         except Exception as e:
-            if self._progress_bar:
-                self._progress_bar.close()
-                self._progress_bar = None
             raise InstallationError(f"Fabric installation failed: {e}")
+        finally:
+            progress.close()
     
-    def _create_progress_callback(self) -> Dict[str, Callable]:
-        """Create progress callback for installation."""
-        def set_status(status: str) -> None:
-            print(f"Status: {status}")
-        
-        def set_progress(progress: int) -> None:
-            if self._progress_bar:
-                self._progress_bar.n = progress
-                self._progress_bar.refresh()
-        
-        def set_max(maximum: int) -> None:
-            if self.config["install"]["enable_progress_bar"]:
-                self._progress_bar = tqdm(
-                    total=maximum, 
-                    desc="Installing Fabric", 
-                    unit="%"
-                )
-        
-        return {
-            "setStatus": set_status,
-            "setProgress": set_progress,
-            "setMax": set_max
-        }
+    def _get_download_threads(self) -> int:
+        """Get how many files to download at once."""
+        install_config = self.config["install"]
+        return install_config.get("download_threads", 4) if install_config.get("parallel_downloads", True) else 1
     
-    def _get_install_options(self) -> Dict[str, Any]:
-        """Get installation options from configuration."""
-        options = {}
-        
-        if self.config["install"].get("skip_hash_validation", False):
-            options["skipHashValidation"] = True
-            print("Warning: Hash validation disabled for faster installation")
-        
-        return options
+    def _get_library_tasks(self, profile: Dict[str, Any]) -> List[DownloadTask]:
+        """Build download tasks for the Maven libraries listed in a Fabric profile."""
+        tasks = []
+        for library in profile.get("libraries", []):
+            path = maven_path(library["name"])
+            tasks.append(DownloadTask(
+                library.get("url", FABRIC_MAVEN_URL).rstrip("/") + "/" + path,
+                os.path.join(self.minecraft_dir, "libraries", *path.split("/")),
+                library.get("sha1"),
+                library.get("size")
+            ))
+        return tasks
+    
+    def _write_version_json(self, profile: Dict[str, Any]) -> None:
+        """Write a version JSON into the versions directory."""
+        path = version_json_path(self.minecraft_dir, profile["id"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=4)
+        os.replace(temp_path, path)
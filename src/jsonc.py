@@ -0,0 +1,146 @@
+"""Comment-tolerant JSON (JSONC) parser that records where every value came from."""
+
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Dict, Tuple
+
+NUMBER_RE = re.compile(r'-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?')
+WHITESPACE = " \t\n\r"
+LITERALS = {"true": True, "false": False, "null": None}
+
+Path = Tuple[Any, ...]
+
+
+class JSONCDecodeError(json.JSONDecodeError):
+    """Raised when a JSONC document cannot be parsed."""
+    pass
+
+
+def line_of(text: str, pos: int) -> int:
+    """Get the 1-based line number of a position in the document."""
+    return text.count("\n", 0, pos) + 1
+
+
+def loads(text: str) -> Any:
+    """Parse a JSONC document, allowing // and /* */ comments and trailing commas."""
+    return parse(text)[0]
+
+
+def parse(text: str) -> Tuple[Any, Dict[Path, int]]:
+    """Parse a JSONC document and return the value plus the start position of every value by path."""
+    parser = _Parser(text)
+    value = parser.parse_document()
+    return value, parser.positions
+
+
+class _Parser:
+    """Recursive descent parser over a JSONC document."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.positions: Dict[Path, int] = {}
+
+    def parse_document(self) -> Any:
+        self._skip()
+        value = self._parse_value(())
+        self._skip()
+        if self.pos != len(self.text):
+            self._error("Extra data")
+        return value
+
+    def _error(self, message: str) -> None:
+        raise JSONCDecodeError(message, self.text, self.pos)
+
+    def _skip(self) -> None:
+        """Skip whitespace and comments."""
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char in WHITESPACE:
+                self.pos += 1
+            elif text.startswith("//", self.pos):
+                end = text.find("\n", self.pos)
+                self.pos = len(text) if end == -1 else end + 1
+            elif text.startswith("/*", self.pos):
+                end = text.find("*/", self.pos + 2)
+                if end == -1:
+                    self._error("Unterminated comment")
+                self.pos = end + 2
+            else:
+                break
+
+    def _parse_value(self, path: Path) -> Any:
+        self.positions[path] = self.pos
+        if self.pos >= len(self.text):
+            self._error("Expecting value")
+
+        char = self.text[self.pos]
+        if char == "{":
+            return self._parse_object(path)
+        if char == "[":
+            return self._parse_array(path)
+        if char == '"':
+            return self._parse_string()
+
+        for literal, value in LITERALS.items():
+            if self.text.startswith(literal, self.pos):
+                self.pos += len(literal)
+                return value
+
+        match = NUMBER_RE.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            integer, fraction, exponent = match.group(0), match.group(1), match.group(2)
+            return float(integer) if fraction or exponent else int(integer)
+
+        self._error("Expecting value")
+
+    def _parse_string(self) -> str:
+        value, self.pos = scanstring(self.text, self.pos + 1)
+        return value
+
+    def _parse_object(self, path: Path) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        self.pos += 1
+        self._skip()
+        while self.pos < len(self.text) and self.text[self.pos] != "}":
+            if self.text[self.pos] != '"':
+                self._error("Expecting property name enclosed in double quotes")
+            key = self._parse_string()
+            self._skip()
+            if self.text[self.pos:self.pos + 1] != ":":
+                self._error("Expecting ':' delimiter")
+            self.pos += 1
+            self._skip()
+            result[key] = self._parse_value(path + (key,))
+            self._skip()
+            if self.text[self.pos:self.pos + 1] == ",":
+                self.pos += 1
+                self._skip()
+            elif self.text[self.pos:self.pos + 1] != "}":
+                self._error("Expecting ',' delimiter")
+
+        if self.pos >= len(self.text):
+            self._error("Expecting '}'")
+        self.pos += 1
+        return result
+
+    def _parse_array(self, path: Path) -> list:
+        result = []
+        self.pos += 1
+        self._skip()
+        while self.pos < len(self.text) and self.text[self.pos] != "]":
+            result.append(self._parse_value(path + (len(result),)))
+            self._skip()
+            if self.text[self.pos:self.pos + 1] == ",":
+                self.pos += 1
+                self._skip()
+            elif self.text[self.pos:self.pos + 1] != "]":
+                self._error("Expecting ',' delimiter")
+
+        if self.pos >= len(self.text):
+            self._error("Expecting ']'")
+        self.pos += 1
+        return result
@@ -1,33 +1,47 @@
 """Minecraft launcher functionality."""
 
+import codecs
+import json
 import os
 import subprocess
 import sys
-from typing import Dict, Any, List
+import threading
+import time
+from typing import Dict, Any, List, Optional, TextIO
 import minecraft_launcher_lib as mcl
 
+from classpath_archive import ClasspathArchive, summarize_classpath_modes
+from deadline import THREAD_PREFIX as DEADLINE_THREAD_PREFIX
 from exceptions import LaunchError, JavaNotFoundError
+from game_watchdog import resident_memory_kb, watchdog_command
+from mod_profiler import LaunchHistory, ModIndex, StartupProfiler, print_startup_report
 from platform_utils import PlatformUtils
+from process_placement import ProcessPlacement
+from server_ping import parse_address
+from version_data import load_version_chain
 
 
 class MinecraftLauncher:
     """Handles launching Minecraft with the specified configuration."""
 
-    def __init__(self, minecraft_dir: str, config: Dict[str, Any]):
+    def __init__(self, minecraft_dir: str, config: Dict[str, Any], data_dir: Optional[str] = None):
         self.minecraft_dir = minecraft_dir
         self.config = config
+        self.data_dir = data_dir
+        self.output_log_path = os.path.join(minecraft_dir, "logs", "quickmc-output.log")
+        self.placement = ProcessPlacement(config.get("launch", {}).get("process", {}))
+        self.classpath_archive = ClasspathArchive(minecraft_dir)
 
-    def launch(self, version: str, login_data: Dict[str, Any]) -> None:
-        """Launch Minecraft with the specified version and login data."""
+    def launch(self, version: str, login_data: Dict[str, Any], server: Optional[str] = None,
+               game_dir: Optional[str] = None) -> None:
+        """Launch Minecraft with the specified version and login data, optionally joining a server."""
         try:
-            # Build launch options
-            options = self._build_launch_options(version, login_data)
-
             # Get launch command
-            command = mcl.command.get_minecraft_command(version, self.minecraft_dir, options)
+            command = self.get_command(version, login_data, game_dir=game_dir, server=server)
 
-            # Change to Minecraft directory
-            os.chdir(self.minecraft_dir)
+            # Change to the game directory
+            game_dir = game_dir or self.minecraft_dir
+            os.chdir(game_dir)
 
             print("Launching Minecraft...")
 
@@ -35,7 +49,7 @@ class MinecraftLauncher:
             if self.config["launch"].get("close_launcher", False):
                 self._launch_detached(command)
             else:
-                self._launch_blocking(command)
+                self._launch_blocking(command, version, game_dir)
 
         except FileNotFoundError as e:
             java_path = self.config["java"]["executable_path"]
@@ -46,13 +60,53 @@ class MinecraftLauncher:
         except Exception as e:
             raise LaunchError(f"Failed to launch Minecraft: {e}") from e
 
-    def _build_launch_options(self, version: str, login_data: Dict[str, Any]) -> Dict[str, Any]:
+    def get_command(self, version: str, login_data: Dict[str, Any], game_dir: Optional[str] = None,
+                    memory: Optional[Dict[str, str]] = None, server: Optional[str] = None,
+                    recording_tag: Optional[str] = None) -> List[str]:
+        """Build the full Minecraft command line for the given version and login data.
+
+        recording_tag is added to the JFR recording name so concurrent clients do not share one file.
+        """
+        options = self._build_launch_options(version, login_data, game_dir, memory, server, recording_tag)
+        command = mcl.command.get_minecraft_command(version, self.minecraft_dir, options)
+        if self._uses_merged_classpath():
+            command = self.classpath_archive.apply(command, version)
+        return command
+
+    def spawn(self, command: List[str], cwd: Optional[str] = None, capture_output: bool = False,
+              placement: Optional[ProcessPlacement] = None, new_console: bool = False) -> subprocess.Popen:
+        """Start Minecraft without waiting, optionally capturing its combined output.
+
+        new_console gives the game its own console window on Windows.
+        """
+        output = subprocess.PIPE if capture_output else subprocess.DEVNULL
+        command = placement.prepare(command) if placement else command
+        creation_flags = subprocess.CREATE_NEW_CONSOLE if new_console and PlatformUtils.get_system() == "windows" else 0
+        process = subprocess.Popen(
+            command,
+            cwd=cwd or self.minecraft_dir,
+            stdout=output,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=capture_output,
+            errors="replace" if capture_output else None,
+            creationflags=creation_flags
+        )
+        if placement:
+            placement.after_spawn(process.pid)
+        return process
+
+    def _build_launch_options(self, version: str, login_data: Dict[str, Any], game_dir: Optional[str] = None,
+                              memory: Optional[Dict[str, str]] = None, server: Optional[str] = None,
+                              recording_tag: Optional[str] = None) -> Dict[str, Any]:
         """Build launch options from configuration and login data."""
         java_config = self.config["java"]
+        if memory:
+            java_config = {**java_config, "memory": {**java_config["memory"], **memory}}
         launch_config = self.config.get("launch", {})
 
         # Build JVM arguments
-        jvm_args = self._build_jvm_arguments(version, java_config, launch_config)
+        jvm_args = self._build_jvm_arguments(version, java_config, launch_config, recording_tag)
 
         options = {
             "username": login_data["name"],
@@ -63,16 +117,46 @@ class MinecraftLauncher:
             "jvmArguments": jvm_args,
             "launcherName": "QuickMC",
             "launcherVersion": "1.4",
-            "gameDirectory": self.minecraft_dir
+            "gameDirectory": game_dir or self.minecraft_dir,
+            "nativesDirectory": self._get_natives_directory(version)
         }
 
         # Add optional settings
         if launch_config.get("skip_asset_verification", False):
             options["skipAssetVerification"] = True
 
+        if server:
+            options.update(self._get_join_options(version, server))
+
         return options
 
-    def _build_jvm_arguments(self, version: str, java_config: Dict[str, Any], launch_config: Dict[str, Any]) -> List[str]:
+    def _get_natives_directory(self, version: str) -> str:
+        """Get the natives directory of the version that lists the native libraries.
+
+        Natives are extracted when the vanilla version is installed, and a Fabric version only
+        inherits its libraries, so its own natives directory would be empty.
+        """
+        try:
+            version = load_version_chain(self.minecraft_dir, version)[-1]["id"]
+        except FileNotFoundError:
+            pass
+        return os.path.join(self.minecraft_dir, "versions", version, "natives")
+
+    def _get_join_options(self, version: str, server: str) -> Dict[str, Any]:
+        """Build the options that make the game join a server directly."""
+        try:
+            chain = load_version_chain(self.minecraft_dir, version)
+        except FileNotFoundError:
+            chain = []
+
+        # 1.20+ replaced --server/--port with Quick Play
+        if any("is_quick_play_multiplayer" in json.dumps(data.get("arguments", {})) for data in chain):
+            return {"quickPlayMultiplayer": server}
+        host, port = parse_address(server)
+        return {"server": host, "port": str(port)}
+
+    def _build_jvm_arguments(self, version: str, java_config: Dict[str, Any], launch_config: Dict[str, Any],
+                             recording_tag: Optional[str] = None) -> List[str]:
         """Build JVM arguments from configuration."""
         jvm_args = [
             f"-Xms{java_config['memory']['min']}",
@@ -81,10 +165,11 @@ class MinecraftLauncher:
 
         # Add configured JVM arguments
         jvm_args.extend(java_config["jvm_arguments"])
+        jvm_args.extend(self._get_profiling_arguments(recording_tag))
 
         # Add startup optimizations
         if launch_config.get("preload_natives", True):
-            natives_path = os.path.join(self.minecraft_dir, "versions", version, "natives")
+            natives_path = self._get_natives_directory(version)
             jvm_args.extend([
                 f"-Djava.library.path={natives_path}",
                 "-Dfile.encoding=UTF-8"
@@ -92,37 +177,163 @@ class MinecraftLauncher:
 
         return jvm_args
 
-    def _launch_detached(self, command: List[str]) -> None:
-        """Launch Minecraft in background and exit launcher immediately."""
+    def spawn_detached(self, command: List[str], cwd: Optional[str] = None, output_path: Optional[str] = None,
+                       placement: Optional[ProcessPlacement] = None) -> subprocess.Popen:
+        """Start Minecraft fully detached from the launcher process, optionally logging its output to a file."""
         system = PlatformUtils.get_system()
+        output = self._open_output_log(output_path) if output_path else subprocess.DEVNULL
+        command = placement.prepare(command) if placement else command
+
+        try:
+            if system == "windows":
+                # Windows: detach properly
+                return subprocess.Popen(
+                    command,
+                    cwd=cwd,
+                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
+                    stdout=output,
+                    stderr=subprocess.STDOUT
+                )
 
-        if system == "windows":
-            # Windows: detach properly
-            subprocess.Popen(
-                command,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-        else:
             # Unix-like systems: standard backgrounding
-            subprocess.Popen(
+            process = subprocess.Popen(
                 command,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+                cwd=cwd,
+                stdout=output,
+                stderr=subprocess.STDOUT,
                 start_new_session=True
             )
+            if placement:
+                placement.after_spawn(process.pid)
+            return process
+        finally:
+            if output is not subprocess.DEVNULL:
+                output.close()
+
+    def _launch_detached(self, command: List[str]) -> None:
+        """Launch Minecraft in background and exit launcher immediately."""
+        self.spawn_detached(command, output_path=self.output_log_path, placement=self.placement)
 
         print("Minecraft launched in background. Launcher exiting...")
 
-    def _launch_blocking(self, command: List[str]) -> None:
-        """Launch Minecraft and wait for it to complete."""
-        system = PlatformUtils.get_system()
+    def _launch_blocking(self, command: List[str], version: str, game_dir: str) -> None:
+        """Launch Minecraft, echoing and logging its output and profiling startup, and wait for it to complete."""
+        profiling_config = self.config.get("profiling", {})
+        mods_dir = os.path.join(game_dir, "mods") if profiling_config.get("enabled", False) else None
+        profiler = StartupProfiler(ModIndex(mods_dir), profiling_config.get("end_marker", "Sound engine started"))
+
+        # Windows: the game gets its own console when the launcher runs in a terminal
+        process = self.spawn(command, cwd=game_dir, capture_output=True, placement=self.placement,
+                             new_console=sys.stdout.isatty())
+        # Read the pipe directly so no output is stuck in a Python buffer if the launcher hands off
+        fd = process.stdout.fileno()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        watchdog = self.config["launch"].get("watchdog", True) and os.name == "posix"
+        with self._open_output_log(self.output_log_path) as log:
+            while True:
+                data = os.read(fd, 65536)
+                if not data:
+                    break
+
+                *lines, pending = (pending + decoder.decode(data)).split("\n")
+                for line in lines:
+                    line += "\n"
+                    sys.stdout.write(line)
+                    log.write(line)
+                    if not profiler.finished:
+                        profiler.feed(line)
+                        if profiler.finished:
+                            self._record_startup(profiler, version)
+
+                # Handing off between lines keeps the watchdog's messages on their own lines, and
+                # waiting for whole characters leaves nothing behind in the decoder
+                if (watchdog and profiler.finished and not pending and not decoder.getstate()[0]
+                        and not self._has_background_work()):
+                    # Only returns if the watchdog could not be started
+                    self._hand_off(process, fd, log)
+                    watchdog = False
+
+            sys.stdout.write(pending)
+            log.write(pending)
+
+        process.wait()
+
+    @staticmethod
+    def _has_background_work() -> bool:
+        """Check if replacing the process would kill background work such as deferred downloads.
+
+        Calls that outlived their deadline, such as a token revalidation that saves a refreshed
+        token, run in daemon threads but still have to finish.
+        """
+        return any(
+            thread is not threading.main_thread() and (not thread.daemon or thread.name.startswith(DEADLINE_THREAD_PREFIX))
+            for thread in threading.enumerate()
+        )
+
+    def _hand_off(self, process: subprocess.Popen, fd: int, log: TextIO) -> None:
+        """Replace the launcher process with the minimal watchdog, which keeps the game's pipe."""
+        launcher_rss = resident_memory_kb() or 0
+        argv = watchdog_command() + [str(process.pid), str(fd), self.output_log_path, str(launcher_rss)]
 
-        if system == "windows":
-            # Windows: handle console properly
-            creation_flags = subprocess.CREATE_NEW_CONSOLE if sys.stdout.isatty() else 0
-            subprocess.run(command, creationflags=creation_flags)
+        try:
+            # Anything still buffered would be lost by exec
+            sys.stdout.flush()
+            log.flush()
+            os.set_inheritable(fd, True)
+            os.execv(argv[0], argv)
+        except (OSError, ValueError) as e:
+            # ValueError: the output was closed or replaced by something that cannot be flushed
+            print(f"Warning: Failed to start the watchdog, the launcher stays resident: {e}")
+
+    def _record_startup(self, profiler: StartupProfiler, version: str) -> None:
+        """Store the launch timing and print the mod profile if profiling is enabled."""
+        profiling_config = self.config.get("profiling", {})
+        entry = profiler.report()
+        entry["version"] = version
+        entry["classpath"] = "merged" if self._uses_merged_classpath() else "plain"
+
+        if not profiling_config.get("enabled", False):
+            print(f"Startup took {entry['startup_seconds']:.2f}s")
+            # Without instrumentation the per-mod split is not meaningful
+            entry["mods"] = {}
+
+        if self.data_dir:
+            history = LaunchHistory(self.data_dir)
+            previous = history.previous(version)
+            history.append(entry)
+            comparison = summarize_classpath_modes(history.load(), version)
+            if comparison:
+                print(comparison)
         else:
-            # Unix-like systems: standard launch
-            subprocess.run(command)
+            previous = None
+
+        if profiling_config.get("enabled", False):
+            print_startup_report(entry, previous, profiling_config.get("top", 15))
+
+    def _uses_merged_classpath(self) -> bool:
+        return self.config.get("launch", {}).get("merged_classpath", False)
+
+    def _get_profiling_arguments(self, recording_tag: Optional[str] = None) -> List[str]:
+        """Build JVM arguments that make startup costs visible in the game output."""
+        profiling_config = self.config.get("profiling", {})
+        if not profiling_config.get("enabled", False):
+            return []
+
+        jvm_args = []
+        if profiling_config.get("mixin_verbose", True):
+            jvm_args.append("-Dmixin.debug.verbose=true")
+        if profiling_config.get("jfr", False) and self.data_dir:
+            profiles_dir = os.path.join(self.data_dir, "profiles")
+            os.makedirs(profiles_dir, exist_ok=True)
+            name = f"startup-{time.strftime('%Y%m%d-%H%M%S')}" + (f"-{recording_tag}" if recording_tag else "")
+            recording = os.path.join(profiles_dir, f"{name}.jfr")
+            jvm_args.append(f"-XX:StartFlightRecording=duration=120s,settings=profile,filename={recording}")
+            print(f"Recording startup with JFR to {recording}")
+        return jvm_args
+
+    @staticmethod
+    def _open_output_log(path: str) -> TextIO:
+        """Open the file that receives the game's output."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return open(path, "w", errors="replace")
@@ -5,19 +5,87 @@ QuickMC - A simplified Minecraft launcher
 This is the main entry point for the QuickMC launcher application.
 """
 
-from app import QuickMCApp
+import argparse
+import os
+import sys
+
+import game_watchdog
+from daemon_client import DaemonClient
 
 # Configuration constants
 DEBUG_OAUTH = False
+INSTALL_DIR = os.path.join(os.path.expanduser("~"), "QuickMC")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="QuickMC", description="THE Fastest MC Launcher.")
+    parser.add_argument("--install-dir", default=INSTALL_DIR, help="QuickMC installation directory")
+    subparsers = parser.add_subparsers(dest="command")
+
+    launch = subparsers.add_parser("launch", help="Launch an instance (through the daemon if it is running)")
+    launch.add_argument("instance", nargs="?", default="default", help="Instance to launch")
+
+    daemon = subparsers.add_parser("daemon", help="Run the resident launcher daemon")
+    daemon.add_argument("--stop", action="store_true", help="Stop the running daemon")
+
+    gc = subparsers.add_parser("gc", help="Remove versions, libraries, assets and runtimes nothing uses anymore")
+    gc.add_argument("--delete", action="store_true", help="Delete unused files (default is a dry run)")
+    gc.add_argument("--archive", metavar="DIR", help="Move unused files into DIR instead of deleting them")
+    gc.add_argument("--keep", action="append", metavar="VERSION", help="Also keep this version (can be repeated)")
+
+    subparsers.add_parser("serve-cache", help="Serve installed files to other QuickMC instances on the network")
+
+    fleet = subparsers.add_parser("fleet", help="Launch many clients concurrently for server load testing")
+    fleet.add_argument("count", type=int, help="Number of clients to launch")
+    fleet.add_argument("--accounts", help="JSON file with a list of offline usernames or login data objects")
+    fleet.add_argument("--username-prefix", help="Prefix for generated offline-mode usernames")
+
+    return parser.parse_args()
 
 
 def main():
     """Main entry point for QuickMC launcher."""
+    # The launcher re-executes itself as the watchdog once the game is running
+    if len(sys.argv) > 1 and sys.argv[1] == game_watchdog.WATCHDOG_COMMAND:
+        game_watchdog.main(sys.argv[2:])
+        return
+
+    args = parse_args()
+    client = DaemonClient(os.path.join(args.install_dir, "data"))
+
+    if args.command == "daemon" and args.stop:
+        if not client.is_running():
+            print("Launcher daemon is not running")
+            sys.exit(1)
+        client.request({"action": "stop"})
+        print("Launcher daemon stopped")
+        return
+
+    # A warm daemon answers before any of the launcher is loaded
+    if args.command in (None, "launch"):
+        response = client.try_launch(getattr(args, "instance", "default"))
+        if response:
+            joining = f", joining {response['server']}" if response.get("server") else ""
+            print(f"Launched {response['version']} (pid {response['pid']}){joining} through the launcher daemon")
+            return
+
+    # Imported here so the daemon fast path does not pay for loading the launcher
+    from app import QuickMCApp
+
     # Create and run the application
-    app = QuickMCApp(debug_oauth=DEBUG_OAUTH)
-    app.run()
+    app = QuickMCApp(install_dir=args.install_dir, debug_oauth=DEBUG_OAUTH)
+    if args.command == "fleet":
+        app.run_fleet(args.count, args.accounts, args.username_prefix)
+    elif args.command == "daemon":
+        app.run_daemon()
+    elif args.command == "gc":
+        app.run_gc(args.delete, args.archive, args.keep)
+    elif args.command == "serve-cache":
+        app.run_cache_server()
+    else:
+        app.run(getattr(args, "instance", "default"))
 
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,213 @@
+"""Per-mod Fabric startup profiling from the game's log output."""
+
+import json
+import os
+import re
+import time
+import zipfile
+from typing import Dict, Any, List, Optional, Tuple
+
+# [12:34:56] [main/INFO] (LoggerName) message
+LOG_LINE = re.compile(r"^\[[^\]]*\] \[[^\]]*\] \(([^)]+)\)")
+# The vanilla logging config uses log4j's XMLLayout, one event spread over several lines:
+# <log4j:Event logger="LoggerName" timestamp="1700000000000" level="INFO" thread="main">
+#   <log4j:Message><![CDATA[message]]></log4j:Message>
+# </log4j:Event>
+XML_EVENT_START = re.compile(r"^\s*<log4j:Event\b([^>]*)>")
+XML_EVENT_END = "</log4j:Event>"
+XML_ATTRIBUTE = re.compile(r'([\w:]+)="([^"]*)"')
+XML_MESSAGE = re.compile(r"<log4j:Message>(.*?)</log4j:Message>", re.DOTALL)
+XML_CDATA = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+# Mixin verbose output: Mixing SomeMixin from modid.mixins.json into net.minecraft.SomeClass
+MIXIN_LINE = re.compile(r"Mixing \S+ from (\S+\.json) into ")
+UNATTRIBUTED = "(minecraft)"
+HISTORY_LIMIT = 50
+
+
+class ModIndex:
+    """Maps mixin configs and logger names in a mods directory to Fabric mod ids."""
+
+    def __init__(self, mods_dir: Optional[str]):
+        self.mixin_configs: Dict[str, str] = {}
+        self.logger_names: Dict[str, str] = {}
+        if mods_dir and os.path.isdir(mods_dir):
+            for entry in os.scandir(mods_dir):
+                if entry.name.endswith(".jar"):
+                    self._index_jar(entry.path)
+
+    def _index_jar(self, path: str) -> None:
+        try:
+            with zipfile.ZipFile(path) as jar:
+                metadata = json.loads(jar.read("fabric.mod.json").decode("utf-8-sig"))
+        except (KeyError, OSError, ValueError, zipfile.BadZipFile):
+            return
+
+        mod_id = metadata.get("id")
+        if not mod_id:
+            return
+
+        self.logger_names[mod_id.lower()] = mod_id
+        if metadata.get("name"):
+            self.logger_names[metadata["name"].lower()] = mod_id
+        for mixin in metadata.get("mixins", []):
+            config = mixin.get("config") if isinstance(mixin, dict) else mixin
+            if config:
+                self.mixin_configs[config] = mod_id
+
+    def mod_for_mixin(self, config: str) -> str:
+        """Get the mod that owns a mixin config."""
+        return self.mixin_configs.get(config, config.split(".")[0])
+
+    def mod_for_logger(self, logger: str) -> Optional[str]:
+        """Get the mod that logs under a logger name."""
+        return self.logger_names.get(logger.lower())
+
+
+class StartupProfiler:
+    """Attributes startup time between log lines to the mod that logged the earlier line.
+
+    Time after a line is assumed to be spent by whoever logged it, so the
+    report is an approximation that gets better with verbose mixin logging.
+    """
+
+    def __init__(self, mod_index: ModIndex, end_marker: str):
+        self.mod_index = mod_index
+        self.end_marker = end_marker
+        self.started = time.monotonic()
+        self.startup_time: Optional[float] = None
+        self.mods: Dict[str, Dict[str, float]] = {}
+        self._last_time = self.started
+        self._last_owner: Tuple[str, str] = (UNATTRIBUTED, "entrypoint")
+        self._event_lines: List[str] = []
+        # Converts XMLLayout's wall clock timestamps to the monotonic clock used here
+        self._clock_offset = time.time() - time.monotonic()
+
+    @property
+    def finished(self) -> bool:
+        """Check if the main menu has been reached."""
+        return self.startup_time is not None
+
+    def feed(self, line: str, timestamp: Optional[float] = None) -> None:
+        """Process one line of game output, either a pattern layout line or part of an XMLLayout event."""
+        if self.finished or not line.strip():
+            return
+
+        if self._event_lines or XML_EVENT_START.match(line):
+            self._event_lines.append(line)
+            if XML_EVENT_END not in line:
+                return
+            message, logger, event_time = self._parse_event("".join(self._event_lines))
+            self._event_lines = []
+            if timestamp is None:
+                timestamp = event_time
+        else:
+            log_line = LOG_LINE.match(line)
+            message, logger = line, log_line.group(1) if log_line else None
+        self._record(message, logger, time.monotonic() if timestamp is None else timestamp)
+
+    def _record(self, message: str, logger: Optional[str], timestamp: float) -> None:
+        """Charge the time since the previous message to its owner and make this message's owner current."""
+        mod_id, phase = self._last_owner
+        times = self.mods.setdefault(mod_id, {"entrypoint": 0.0, "mixin": 0.0})
+        times[phase] += max(0.0, timestamp - self._last_time)
+        self._last_time = max(self._last_time, timestamp)
+        self._last_owner = self._owner_of(message, logger)
+
+        if self.end_marker in message:
+            self.startup_time = self._last_time - self.started
+
+    def _parse_event(self, event: str) -> Tuple[str, Optional[str], Optional[float]]:
+        """Get the message, logger and monotonic time of an XMLLayout event."""
+        start = XML_EVENT_START.match(event)
+        attributes = dict(XML_ATTRIBUTE.findall(start.group(1))) if start else {}
+        body = XML_MESSAGE.search(event)
+        # A message containing "]]>" is split across several CDATA sections
+        message = "".join(XML_CDATA.findall(body.group(1))) if body else ""
+
+        try:
+            event_time = int(attributes["timestamp"]) / 1000 - self._clock_offset
+        except (KeyError, ValueError):
+            event_time = None
+        return message, attributes.get("logger"), event_time
+
+    def _owner_of(self, message: str, logger: Optional[str]) -> Tuple[str, str]:
+        mixin = MIXIN_LINE.search(message)
+        if mixin:
+            return self.mod_index.mod_for_mixin(mixin.group(1)), "mixin"
+
+        if logger:
+            mod_id = self.mod_index.mod_for_logger(logger)
+            if mod_id:
+                return mod_id, "entrypoint"
+        return UNATTRIBUTED, "entrypoint"
+
+    def report(self) -> Dict[str, Any]:
+        """Get the profile as a launch history entry."""
+        return {
+            "timestamp": time.time(),
+            "startup_seconds": round(self.startup_time, 3) if self.finished else None,
+            "mods": {
+                mod_id: {phase: round(seconds, 3) for phase, seconds in times.items()}
+                for mod_id, times in self.mods.items()
+            }
+        }
+
+
+class LaunchHistory:
+    """Stores recent launch timings and mod profiles."""
+
+    def __init__(self, data_dir: str):
+        self.path = os.path.join(data_dir, "launch_history.json")
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Load all stored launches, oldest first."""
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def previous(self, version: str) -> Optional[Dict[str, Any]]:
+        """Get the most recent stored launch of a version that has a mod profile to compare against."""
+        for entry in reversed(self.load()):
+            if entry.get("version") == version and entry.get("mods"):
+                return entry
+        return None
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Store a launch, keeping only the most recent ones."""
+        history = self.load()
+        history.append(entry)
+        try:
+            with open(self.path, "w") as f:
+                json.dump(history[-HISTORY_LIMIT:], f, indent=2)
+        except OSError as e:
+            print(f"Warning: Failed to save launch history: {e}")
+
+
+def print_startup_report(entry: Dict[str, Any], previous: Optional[Dict[str, Any]], top: int = 15) -> None:
+    """Print the mods ranked by startup cost, with deltas against the previous launch."""
+    previous_mods = (previous or {}).get("mods", {})
+
+    def total(times: Dict[str, float]) -> float:
+        return times.get("entrypoint", 0.0) + times.get("mixin", 0.0)
+
+    ranked = sorted(entry["mods"].items(), key=lambda item: total(item[1]), reverse=True)[:top]
+
+    print("\nMod startup profile (approximate):")
+    print(f"  {'Mod':<32} {'Total':>8} {'Entry':>8} {'Mixin':>8} {'Delta':>8}")
+    for mod_id, times in ranked:
+        delta = f"{total(times) - total(previous_mods[mod_id]):+.2f}" if mod_id in previous_mods else "new"
+        print(
+            f"  {mod_id[:32]:<32} {total(times):>8.2f} "
+            f"{times['entrypoint']:>8.2f} {times['mixin']:>8.2f} {delta:>8}"
+        )
+
+    startup = entry.get("startup_seconds")
+    if startup is None:
+        print("  Main menu was not reached")
+        return
+    line = f"  Startup took {startup:.2f}s"
+    if previous and previous.get("startup_seconds") is not None:
+        line += f" ({startup - previous['startup_seconds']:+.2f}s vs previous launch)"
+    print(line)
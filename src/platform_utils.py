@@ -1,10 +1,15 @@
 """Platform-specific utilities and configurations."""
 
+import hashlib
+import importlib.util
+import json
 import os
 import shutil
 import subprocess
 import platform
-from typing import List, Dict, Any
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Optional
 
 
 class PlatformUtils:
@@ -109,12 +114,27 @@ class JavaDetector:
             return False
 
 
+class LazyDefault:
+    """A default value that is only computed if the user config does not override it."""
+    
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+    
+    def resolve(self) -> Any:
+        """Compute the default value."""
+        return self.factory()
+
+
 class PlatformConfig:
     """Platform-specific configuration provider."""
     
     @staticmethod
-    def get_default_config() -> Dict[str, Any]:
-        """Get platform-specific default configuration."""
+    def get_default_config(resolve: bool = True) -> Dict[str, Any]:
+        """Get platform-specific default configuration.
+        
+        With resolve=False, expensive defaults (such as Java detection) are left as
+        LazyDefault placeholders for resolve_defaults() to fill in after merging.
+        """
         base_config = PlatformConfig._get_base_config()
         system = PlatformUtils.get_system()
         
@@ -126,15 +146,29 @@ class PlatformConfig:
         else:  # Linux and other Unix
             PlatformConfig._apply_linux_config(base_config)
         
+        if resolve:
+            PlatformConfig.resolve_defaults(base_config)
         return base_config
     
+    @staticmethod
+    def resolve_defaults(config: Any) -> Any:
+        """Replace any LazyDefault placeholders left in a config with their computed values."""
+        if isinstance(config, LazyDefault):
+            return config.resolve()
+        if isinstance(config, dict):
+            for key, value in config.items():
+                config[key] = PlatformConfig.resolve_defaults(value)
+        elif isinstance(config, list):
+            config[:] = [PlatformConfig.resolve_defaults(value) for value in config]
+        return config
+    
     @staticmethod
     def _get_base_config() -> Dict[str, Any]:
         """Get base configuration that works on all platforms."""
         return {
             "minecraft_version": "1.21.4",
             "java": {
-                "executable_path": JavaDetector.detect_java_executable(),
+                "executable_path": LazyDefault(JavaDetector.detect_java_executable),
                 "memory": {
                     "min": "4G",
                     "max": "6G"
@@ -153,18 +187,70 @@ class PlatformConfig:
             },
             "fabric": {
                 "auto_install": True,
-                "loader_version": "latest"
+                "loader_version": "latest",
+                "meta_url": "https://meta.fabricmc.net"
             },
             "install": {
                 "download_threads": 4,
                 "enable_progress_bar": True,
+                "progress_output": "terminal",
+                "progress_fps": 10,
                 "skip_hash_validation": False,
                 "parallel_downloads": True
             },
             "launch": {
                 "skip_asset_verification": False,
                 "preload_natives": True,
-                "close_launcher": False
+                "close_launcher": False,
+                "merged_classpath": False,
+                "quick_join": [],
+                "quick_join_timeout": 3,
+                "watchdog": True,
+                "process": {
+                    "cpu_affinity": [],
+                    "nice": 0,
+                    "ioprio_class": "",
+                    "ioprio_level": 4,
+                    "launcher_nice": 0,
+                    "cgroup": {
+                        "method": "none",
+                        "path": "quickmc",
+                        "memory_max": "",
+                        "cpu_quota": 0
+                    }
+                }
+            },
+            "network": {
+                "auth_deadline": 5,
+                "install_deadline": 8
+            },
+            "profiling": {
+                "enabled": False,
+                "mixin_verbose": True,
+                "jfr": False,
+                "end_marker": "Sound engine started",
+                "top": 15
+            },
+            "cache": {
+                "peers": [],
+                "peer_timeout": 2,
+                "serve_bind": "0.0.0.0",
+                "serve_port": 25590
+            },
+            "daemon": {
+                "token_refresh_interval": 300,
+                "watch_interval": 2
+            },
+            "fleet": {
+                "max_concurrent_startups": 2,
+                "stagger_seconds": 5,
+                "startup_timeout": 180,
+                "startup_marker": "Sound engine started",
+                "username_prefix": "QuickMC",
+                "memory": {
+                    "min": "1G",
+                    "max": "2G"
+                }
             }
         }
     
@@ -199,6 +285,22 @@ class PlatformConfig:
 class WebViewManager:
     """Manages platform-specific webview backend selection."""
     
+    CACHE_FILE = "webview_backend.json"
+    # Python modules each pywebview backend needs; a backend whose modules are missing cannot start
+    BACKEND_MODULES = {
+        "edgechromium": [["clr"]],
+        "edgehtml": [["clr"]],
+        "mshtml": [["clr"]],
+        "cef": [["cefpython3"]],
+        "cocoa": [["AppKit"], ["WebKit"]],
+        "gtk": [["gi"]],
+        "qt": [["qtpy"], ["PyQt6", "PyQt5", "PySide6", "PySide2"]]
+    }
+    WEBVIEW2_CLIENT_KEY = r"SOFTWARE\Microsoft\EdgeUpdate\Clients\{F3017226-FE2A-4295-8BDF-00C3A9A7E4C5}"
+    
+    def __init__(self, data_dir: Optional[str] = None):
+        self.cache_path = os.path.join(data_dir, self.CACHE_FILE) if data_dir else None
+    
     @staticmethod
     def get_backends() -> List[str]:
         """Get preferred webview backends for the current platform."""
@@ -212,3 +314,126 @@ class WebViewManager:
             return ['gtk', 'qt', 'cef']
         else:
             return ['qt', 'gtk', 'cef']
+    
+    def select_backends(self) -> Iterator[str]:
+        """Yield the backends worth trying, the one that worked last time on this machine first.
+        
+        The others are only probed if the cached backend is missing, stale or fails to start.
+        """
+        cache = self._load_cache()
+        cached = cache.get("backend") if cache.get("fingerprint") == self._get_environment_fingerprint() else None
+        if cached:
+            yield cached
+        
+        backends = [backend for backend in self.get_backends() if backend != cached]
+        with ThreadPoolExecutor(max_workers=len(backends)) as executor:
+            available = list(executor.map(self.probe_backend, backends))
+        yield from (backend for backend, ok in zip(backends, available) if ok)
+    
+    def remember(self, backend: str) -> None:
+        """Cache a backend that started successfully."""
+        self._save_cache({"fingerprint": self._get_environment_fingerprint(), "backend": backend})
+    
+    def forget(self) -> None:
+        """Drop the cached backend, e.g. after it failed to start."""
+        self._save_cache({})
+    
+    @classmethod
+    def probe_backend(cls, backend: str) -> bool:
+        """Cheaply check if a backend can start, without loading its GUI toolkit."""
+        system = PlatformUtils.get_system()
+        if system not in ("windows", "darwin") and backend in ("gtk", "qt", "cef"):
+            if not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+                return False
+        
+        for alternatives in cls.BACKEND_MODULES.get(backend, []):
+            if not any(cls._has_module(module) for module in alternatives):
+                return False
+        
+        if backend == "gtk":
+            return cls._has_gtk_webkit()
+        if backend == "edgechromium":
+            return cls._has_webview2_runtime()
+        return True
+    
+    @staticmethod
+    def _has_module(name: str) -> bool:
+        try:
+            return importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            return False
+    
+    @staticmethod
+    def _has_gtk_webkit() -> bool:
+        """Check that the GTK and WebKit2 typelibs are installed (checks metadata only, loads no libraries)."""
+        try:
+            import gi
+            gi.require_version("Gtk", "3.0")
+        except (ImportError, ValueError):
+            return False
+        for version in ("4.1", "4.0"):
+            try:
+                gi.require_version("WebKit2", version)
+                return True
+            except ValueError:
+                continue
+        return False
+    
+    @classmethod
+    def _has_webview2_runtime(cls) -> bool:
+        """Check the registry for the Edge WebView2 runtime."""
+        try:
+            import winreg
+        except ImportError:
+            return False
+        for root, key in [
+            (winreg.HKEY_LOCAL_MACHINE, cls.WEBVIEW2_CLIENT_KEY.replace("SOFTWARE\\", "SOFTWARE\\WOW6432Node\\", 1)),
+            (winreg.HKEY_LOCAL_MACHINE, cls.WEBVIEW2_CLIENT_KEY),
+            (winreg.HKEY_CURRENT_USER, cls.WEBVIEW2_CLIENT_KEY)
+        ]:
+            try:
+                with winreg.OpenKey(root, key) as handle:
+                    if winreg.QueryValueEx(handle, "pv")[0] not in ("", "0.0.0.0"):
+                        return True
+            except OSError:
+                continue
+        return False
+    
+    def _get_environment_fingerprint(self) -> str:
+        """Describe everything a backend's availability depends on, so a cached choice expires with it."""
+        parts = [platform.system(), platform.release(), platform.machine(), sys.version]
+        parts.extend(f"{name}={os.environ.get(name, '')}" for name in ("DISPLAY", "WAYLAND_DISPLAY", "XDG_SESSION_TYPE"))
+        import importlib.metadata  # Import here, it is slow to load and only needed for interactive login
+        try:
+            parts.append(importlib.metadata.version("pywebview"))
+        except importlib.metadata.PackageNotFoundError:
+            pass
+        
+        modules = sorted({module for groups in self.BACKEND_MODULES.values() for group in groups for module in group})
+        for module in ["webview"] + modules:
+            try:
+                spec = importlib.util.find_spec(module)
+            except (ImportError, ValueError):
+                spec = None
+            origin = spec.origin if spec and spec.origin else ""
+            mtime = os.path.getmtime(origin) if origin and os.path.exists(origin) else 0
+            parts.append(f"{module}={origin}:{mtime}")
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+    
+    def _load_cache(self) -> Dict[str, Any]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_cache(self, data: Dict[str, Any]) -> None:
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, "w") as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"Warning: Failed to save webview backend cache: {e}")
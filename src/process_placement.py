@@ -0,0 +1,299 @@
+"""Linux CPU affinity, scheduling priority and cgroup placement for the game process."""
+
+import ctypes
+import functools
+import os
+import platform
+import re
+import shutil
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from platform_utils import PlatformUtils
+
+IOPRIO_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+IOPRIO_CLASS_NAMES = {value: key for key, value in IOPRIO_CLASSES.items()}
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+# (ioprio_set, ioprio_get) syscall numbers; glibc has no wrapper for them
+IOPRIO_SYSCALLS = {
+    "x86_64": (251, 252),
+    "i386": (289, 290),
+    "i686": (289, 290),
+    "aarch64": (30, 31),
+    "riscv64": (30, 31),
+    "armv7l": (314, 315)
+}
+CGROUP_ROOT = "/sys/fs/cgroup"
+CGROUP_METHODS = ["none", "systemd-run", "cgroupfs"]
+CPU_PERIOD = 100000
+EXEC_WAIT_TIMEOUT = 5.0  # Seconds to wait for systemd-run to exec into the game
+# systemd's size suffixes are powers of 1024
+SIZE_PATTERN = re.compile(r"(\d+)([KMGTPE]?)", re.IGNORECASE)
+SIZE_SUFFIXES = "KMGTPE"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_libc() -> ctypes.CDLL:
+    return ctypes.CDLL(None, use_errno=True)
+
+
+def _syscall(index: int, *args: int) -> int:
+    numbers = IOPRIO_SYSCALLS.get(platform.machine())
+    if numbers is None:
+        raise OSError(f"ioprio is not supported on {platform.machine()}")
+    result = _load_libc().syscall(numbers[index], *args)
+    if result < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return result
+
+
+def set_ioprio(pid: int, ioprio_class: str, level: int) -> None:
+    """Set the I/O scheduling class and level of a process (0 = the calling process)."""
+    _syscall(0, IOPRIO_WHO_PROCESS, pid, (IOPRIO_CLASSES[ioprio_class] << IOPRIO_CLASS_SHIFT) | level)
+
+
+def get_ioprio(pid: int) -> Tuple[str, int]:
+    """Get the I/O scheduling class and level of a process."""
+    value = _syscall(1, IOPRIO_WHO_PROCESS, pid)
+    return IOPRIO_CLASS_NAMES.get(value >> IOPRIO_CLASS_SHIFT, "none"), value & ((1 << IOPRIO_CLASS_SHIFT) - 1)
+
+
+def _parse_size(value: str) -> Optional[int]:
+    """Convert a systemd size such as 4G to bytes, or None for forms (percentages) that cannot be checked."""
+    match = SIZE_PATTERN.fullmatch(value.strip())
+    if not match:
+        return None
+    number, suffix = match.groups()
+    return int(number) * 1024 ** (SIZE_SUFFIXES.index(suffix.upper()) + 1 if suffix else 0)
+
+
+class ProcessPlacement:
+    """Applies the launch.process settings to the game and reports what actually took effect."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.cpu_affinity: List[int] = config.get("cpu_affinity", [])
+        self.nice: int = config.get("nice", 0)
+        self.ioprio_class: str = config.get("ioprio_class", "")
+        self.ioprio_level: int = config.get("ioprio_level", 4)
+        self.launcher_nice: int = config.get("launcher_nice", 0)
+        cgroup_config = config.get("cgroup", {})
+        self.cgroup_method: str = cgroup_config.get("method", "none")
+        self.cgroup_path: str = cgroup_config.get("path", "quickmc")
+        self.memory_max: str = cgroup_config.get("memory_max", "")
+        self.cpu_quota: int = cgroup_config.get("cpu_quota", 0)
+        self._cgroup_path: Optional[str] = None
+        self._uses_systemd_run = False
+        self._launcher_lowered = False
+
+        if self.ioprio_class and self.ioprio_class not in IOPRIO_CLASSES:
+            print(f"Warning: Unknown ioprio_class '{self.ioprio_class}', ignoring it")
+            self.ioprio_class = ""
+        if self.cgroup_method not in CGROUP_METHODS:
+            print(f"Warning: Unknown cgroup method '{self.cgroup_method}', ignoring it")
+            self.cgroup_method = "none"
+
+    @property
+    def is_configured(self) -> bool:
+        """Check if any placement setting differs from the defaults."""
+        return bool(self.cpu_affinity or self.nice or self.ioprio_class
+                    or self.launcher_nice or self.cgroup_method != "none")
+
+    @property
+    def is_active(self) -> bool:
+        """Check if placement should be applied on this system."""
+        return self.is_configured and PlatformUtils.get_system() == "linux"
+
+    def prepare(self, command: List[str]) -> List[str]:
+        """Get the command to run, setting up the cgroup it will be placed in."""
+        if not self.is_configured:
+            return command
+        if not self.is_active:
+            print("Warning: launch.process settings are only supported on Linux, ignoring them")
+            return command
+
+        self._uses_systemd_run = False
+        if self.cgroup_method == "systemd-run":
+            prefix = self._systemd_run_prefix()
+            self._uses_systemd_run = bool(prefix)
+            command = prefix + command
+        elif self.cgroup_method == "cgroupfs":
+            self._cgroup_path = self._create_cgroup()
+        return command
+
+    def after_spawn(self, pid: int) -> None:
+        """Apply the game's placement, drop the launcher's own priority and report what took effect."""
+        if not self.is_active:
+            return
+        if self._cgroup_path:
+            self._join_cgroup(pid)
+        self._apply(pid)
+        # os.nice() is relative, so a long-running daemon must only lower itself once
+        if self.launcher_nice and not self._launcher_lowered:
+            self._launcher_lowered = True
+            try:
+                os.nice(self.launcher_nice)
+                set_ioprio(0, "best-effort", 7)
+            except OSError as e:
+                print(f"Warning: Failed to lower launcher priority: {e}")
+        if self._uses_systemd_run and not self._wait_for_exec(pid):
+            print("Warning: systemd-run did not start the game in time, settings are reported for systemd-run")
+        self.report(pid)
+
+    def report(self, pid: int) -> None:
+        """Print the game's effective affinity, priority and cgroup as read back from /proc."""
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                status = dict(line.split(":", 1) for line in f if ":" in line)
+            with open(f"/proc/{pid}/stat", "r") as f:
+                # Fields after the parenthesised command name; nice is field 19
+                nice = int(f.read().rsplit(")", 1)[1].split()[16])
+            with open(f"/proc/{pid}/cgroup", "r") as f:
+                cgroup = f.readline().strip().split(":", 2)[-1]
+        except (OSError, ValueError, IndexError) as e:
+            print(f"Warning: Could not read game process settings: {e}")
+            return
+
+        try:
+            ioprio = "{}/{}".format(*get_ioprio(pid))
+        except OSError:
+            ioprio = "unknown"
+
+        print(
+            f"Game process {pid}: cpus {status.get('Cpus_allowed_list', '?').strip()}, "
+            f"nice {nice}, ioprio {ioprio}, cgroup {cgroup}"
+        )
+        if self.nice and nice != self.nice:
+            print(f"Warning: Requested nice {self.nice} but the game runs at {nice}")
+        if self._cgroup_path and cgroup != "/" + os.path.relpath(self._cgroup_path, CGROUP_ROOT):
+            print(f"Warning: Game is not in the requested cgroup {self._cgroup_path}")
+        if self._uses_systemd_run:
+            self._check_systemd_scope(cgroup)
+
+    def _apply(self, pid: int) -> None:
+        """Apply affinity and priorities to every thread of the game; failures are left for report() to surface.
+
+        These are per-thread on Linux and the JVM may already be starting threads, so the
+        threads are applied until no new ones appear. Threads created later inherit them.
+        """
+        if not (self.cpu_affinity or self.nice or self.ioprio_class):
+            return
+        applied = set()
+        while True:
+            try:
+                threads = {int(tid) for tid in os.listdir(f"/proc/{pid}/task")} - applied
+            except OSError:
+                return
+            if not threads:
+                return
+            for tid in threads:
+                self._apply_to_thread(tid)
+            applied |= threads
+
+    def _apply_to_thread(self, tid: int) -> None:
+        if self.cpu_affinity:
+            try:
+                os.sched_setaffinity(tid, self.cpu_affinity)
+            except OSError:
+                pass
+        if self.nice:
+            try:
+                os.setpriority(os.PRIO_PROCESS, tid, self.nice)
+            except OSError:
+                pass
+        if self.ioprio_class:
+            try:
+                set_ioprio(tid, self.ioprio_class, self.ioprio_level)
+            except OSError:
+                pass
+
+    def _join_cgroup(self, pid: int) -> None:
+        """Move the game into the cgroup; failures are left for report() to surface.
+
+        This runs in the launcher right after spawn rather than in the forked child, where Python
+        code could deadlock on locks held by the launcher's other threads. Memory the game
+        allocated before the move stays charged to the launcher's group.
+        """
+        try:
+            with open(os.path.join(self._cgroup_path, "cgroup.procs"), "w") as f:
+                f.write(str(pid))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _wait_for_exec(pid: int) -> bool:
+        """Wait until systemd-run has set up the scope and exec'd into the game."""
+        deadline = time.monotonic() + EXEC_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                with open(f"/proc/{pid}/cmdline", "rb") as f:
+                    cmdline = f.read()
+            except OSError:
+                cmdline = b""
+            # An empty command line means the process already exited, report() says so
+            if not cmdline or os.path.basename(cmdline.split(b"\0", 1)[0]) != b"systemd-run":
+                return True
+            time.sleep(0.02)
+        return False
+
+    def _check_systemd_scope(self, cgroup: str) -> None:
+        """Check that the game runs in a transient scope and that the memory limit reached it."""
+        scope = os.path.basename(cgroup)
+        if not (scope.startswith("run-") and scope.endswith(".scope")):
+            print(f"Warning: Game is not in a systemd-run scope (cgroup {cgroup})")
+            return
+        if not self.memory_max:
+            return
+
+        try:
+            with open(os.path.join(CGROUP_ROOT, cgroup.lstrip("/"), "memory.max"), "r") as f:
+                memory_max = f.read().strip()
+        except OSError as e:
+            print(f"Warning: Could not read the memory limit of {scope}: {e}")
+            return
+        expected = _parse_size(self.memory_max)
+        if expected is None:
+            return
+        # The kernel rounds the limit down to whole pages
+        expected -= expected % os.sysconf("SC_PAGE_SIZE")
+        if memory_max == "max" or int(memory_max) != expected:
+            print(f"Warning: Requested MemoryMax={self.memory_max} but {scope} has memory.max {memory_max}")
+
+    def _systemd_run_prefix(self) -> List[str]:
+        """Build a systemd-run prefix that starts the game in its own transient scope."""
+        if not shutil.which("systemd-run"):
+            print("Warning: systemd-run not found, starting the game without a cgroup")
+            return []
+        prefix = ["systemd-run", "--user", "--scope", "--quiet", "--collect"]
+        if self.memory_max:
+            prefix.extend(["-p", f"MemoryMax={self.memory_max}"])
+        if self.cpu_quota:
+            prefix.extend(["-p", f"CPUQuota={self.cpu_quota}%"])
+        return prefix + ["--"]
+
+    def _create_cgroup(self) -> Optional[str]:
+        """Create (or reuse) a cgroup v2 group and apply its limits.
+
+        The path is relative to the cgroup root and has to be writable, e.g. a
+        subtree delegated to the user.
+        """
+        path = os.path.join(CGROUP_ROOT, self.cgroup_path.strip("/"))
+        try:
+            os.makedirs(path, exist_ok=True)
+            try:
+                with open(os.path.join(os.path.dirname(path), "cgroup.subtree_control"), "w") as f:
+                    f.write("+memory +cpu")
+            except OSError:
+                # Already enabled, or not allowed here; the limits below fail loudly if it matters
+                pass
+            if self.memory_max:
+                with open(os.path.join(path, "memory.max"), "w") as f:
+                    f.write(self.memory_max)
+            if self.cpu_quota:
+                with open(os.path.join(path, "cpu.max"), "w") as f:
+                    f.write(f"{self.cpu_quota * CPU_PERIOD // 100} {CPU_PERIOD}")
+            return path
+        except OSError as e:
+            print(f"Warning: Failed to set up cgroup {path}: {e}")
+            return None
@@ -0,0 +1,185 @@
+"""Progress event bus that coalesces install progress updates and fans them out to sinks."""
+
+import json
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Optional, TextIO
+
+from tqdm import tqdm
+
+
+class ProgressSink:
+    """Receives coalesced progress snapshots from the bus."""
+
+    def update(self, snapshot: Dict[str, Any]) -> None:
+        """Show the current state of a phase."""
+        pass
+
+    def end_phase(self, snapshot: Dict[str, Any]) -> None:
+        """Show that a phase has finished."""
+        pass
+
+    def close(self) -> None:
+        """Release any resources held by the sink."""
+        pass
+
+
+class SilentSink(ProgressSink):
+    """Discards all progress."""
+    pass
+
+
+class TerminalSink(ProgressSink):
+    """Shows one terminal progress bar per phase."""
+
+    def __init__(self):
+        self._bar: Optional[tqdm] = None
+
+    def update(self, snapshot: Dict[str, Any]) -> None:
+        if self._bar is None:
+            self._bar = tqdm(total=snapshot["total_items"], desc=snapshot["phase"], unit="file")
+        if snapshot["total_items"] is not None:
+            self._bar.total = snapshot["total_items"]
+        self._bar.n = snapshot["items"]
+        self._bar.set_postfix_str(self._format_postfix(snapshot), refresh=False)
+        self._bar.refresh()
+
+    def end_phase(self, snapshot: Dict[str, Any]) -> None:
+        if self._bar is not None:
+            self.update(snapshot)
+            self._bar.close()
+            self._bar = None
+
+    def close(self) -> None:
+        if self._bar is not None:
+            self._bar.close()
+            self._bar = None
+
+    @staticmethod
+    def _format_postfix(snapshot: Dict[str, Any]) -> str:
+        parts = []
+        if snapshot["bytes"]:
+            parts.append(f"{snapshot['bytes'] / 1048576:.1f} MB")
+        return " | ".join(parts)
+
+
+class JsonLinesSink(ProgressSink):
+    """Writes every snapshot as one JSON object per line, for wrappers and GUIs."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+
+    def update(self, snapshot: Dict[str, Any]) -> None:
+        self._write("progress", snapshot)
+
+    def end_phase(self, snapshot: Dict[str, Any]) -> None:
+        self._write("phase_end", snapshot)
+
+    def _write(self, event: str, snapshot: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps({"event": event, **snapshot}) + "\n")
+        self.stream.flush()
+
+
+class ProgressBus:
+    """Tracks items and bytes per phase and publishes updates to sinks at a fixed frame rate."""
+
+    def __init__(self, sinks: List[ProgressSink], fps: float = 10.0):
+        self.sinks = sinks
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self._lock = threading.Lock()
+        self._last_emit = 0.0
+        self._phase: Optional[str] = None
+        self._reset_phase(None)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ProgressBus":
+        """Create a bus with the sink selected in the install config."""
+        install_config = config.get("install", {})
+        output = install_config.get("progress_output", "terminal")
+        if not install_config.get("enable_progress_bar", True):
+            output = "silent"
+
+        sinks = {
+            "terminal": TerminalSink,
+            "jsonl": JsonLinesSink,
+            "silent": SilentSink
+        }
+        if output not in sinks:
+            print(f"Warning: Unknown progress output '{output}', using terminal")
+            output = "terminal"
+        return cls([sinks[output]()], install_config.get("progress_fps", 10))
+
+    def start_phase(self, phase: str, total_items: Optional[int] = None, total_bytes: Optional[int] = None) -> None:
+        """Finish the current phase and start tracking a new one."""
+        with self._lock:
+            self._end_phase()
+            self._reset_phase(phase)
+            self._total_items = total_items
+            self._total_bytes = total_bytes
+            self._emit(force=True)
+
+    def advance(self, items: int = 1, nbytes: int = 0) -> None:
+        """Record finished items and downloaded bytes in the current phase."""
+        with self._lock:
+            self._items += items
+            self._bytes += nbytes
+            self._emit()
+
+    def close(self) -> None:
+        """Finish the current phase and close all sinks."""
+        with self._lock:
+            self._end_phase()
+            self._reset_phase(None)
+        for sink in self.sinks:
+            sink.close()
+
+    def _reset_phase(self, phase: Optional[str]) -> None:
+        self._phase = phase
+        self._items = 0
+        self._bytes = 0
+        self._total_items: Optional[int] = None
+        self._total_bytes: Optional[int] = None
+        self._started = time.monotonic()
+
+    def _end_phase(self) -> None:
+        if self._phase is None:
+            return
+        snapshot = self._snapshot()
+        for sink in self.sinks:
+            sink.end_phase(snapshot)
+
+    def _emit(self, force: bool = False) -> None:
+        """Publish a snapshot if the frame interval has passed (callers hold the lock)."""
+        if self._phase is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_emit < self.interval:
+            return
+        self._last_emit = now
+
+        snapshot = self._snapshot()
+        for sink in self.sinks:
+            sink.update(snapshot)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self._started
+        return {
+            "phase": self._phase,
+            "items": self._items,
+            "total_items": self._total_items,
+            "bytes": self._bytes,
+            "total_bytes": self._total_bytes,
+            "elapsed": round(elapsed, 2),
+            "eta": self._eta(elapsed)
+        }
+
+    def _eta(self, elapsed: float) -> Optional[float]:
+        """Estimate the seconds left in the phase from bytes if known, otherwise items."""
+        if self._total_bytes and self._bytes:
+            done, total = self._bytes, self._total_bytes
+        elif self._total_items and self._items:
+            done, total = self._items, self._total_items
+        else:
+            return None
+        return round(elapsed * (total - done) / done, 1)
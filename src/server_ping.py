@@ -0,0 +1,158 @@
+"""Concurrent Server List Ping for picking the fastest server to quick-join."""
+
+import json
+import socket
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_PORT = 25565
+# Status-only handshakes may send -1 as the protocol version
+STATUS_PROTOCOL_VERSION = -1
+MAX_PACKET_SIZE = 2 * 1024 * 1024
+
+
+class ServerStatus:
+    """A server that answered a status ping."""
+
+    def __init__(self, address: str, latency: float, status: Dict[str, Any]):
+        self.address = address
+        self.latency = latency
+        self.status = status
+
+    @property
+    def players(self) -> str:
+        """Get the player count as online/max."""
+        players = self.status.get("players")
+        if not isinstance(players, dict):
+            players = {}
+        return f"{players.get('online', '?')}/{players.get('max', '?')}"
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """Split host[:port] (or [ipv6]:port) into host and port."""
+    if address.startswith("["):
+        host, _, rest = address[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else DEFAULT_PORT
+    if address.count(":") == 1:
+        host, port = address.split(":")
+        return host, int(port)
+    return address, DEFAULT_PORT
+
+
+def _pack_varint(value: int) -> bytes:
+    value &= 0xFFFFFFFF
+    data = b""
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            data += bytes([byte | 0x80])
+        else:
+            return data + bytes([byte])
+
+
+def _pack_packet(packet_id: int, payload: bytes) -> bytes:
+    body = _pack_varint(packet_id) + payload
+    return _pack_varint(len(body)) + body
+
+
+def _read_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Server closed the connection")
+        data += chunk
+    return data
+
+
+def _read_varint(sock: socket.socket) -> int:
+    value = 0
+    for shift in range(0, 35, 7):
+        byte = _read_exact(sock, 1)[0]
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value
+    raise ValueError("VarInt is too long")
+
+
+def _read_packet(sock: socket.socket) -> Tuple[int, bytes]:
+    length = _read_varint(sock)
+    if not 0 < length <= MAX_PACKET_SIZE:
+        raise ValueError(f"Invalid packet length {length}")
+    data = _read_exact(sock, length)
+    # Packet ids in the status state are a single byte
+    return data[0], data[1:]
+
+
+def _unpack_string(data: bytes) -> str:
+    length = 0
+    for index, byte in enumerate(data[:5]):
+        length |= (byte & 0x7F) << (7 * index)
+        if not byte & 0x80:
+            return data[index + 1:index + 1 + length].decode("utf-8")
+    raise ValueError("VarInt is too long")
+
+
+def ping_server(address: str, timeout: float = 3.0) -> ServerStatus:
+    """Query a server's status and measure its round trip time with a ping packet."""
+    host, port = parse_address(address)
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.settimeout(timeout)
+        encoded_host = host.encode("utf-8")
+        handshake = (_pack_varint(STATUS_PROTOCOL_VERSION) + _pack_varint(len(encoded_host)) + encoded_host
+                     + struct.pack(">H", port) + _pack_varint(1))
+        sock.sendall(_pack_packet(0x00, handshake) + _pack_packet(0x00, b""))
+
+        started = time.monotonic()
+        packet_id, data = _read_packet(sock)
+        if packet_id != 0x00:
+            raise ValueError(f"Unexpected status packet {packet_id:#x}")
+        status = json.loads(_unpack_string(data))
+        if not isinstance(status, dict):
+            raise ValueError("Status response is not a JSON object")
+        latency = time.monotonic() - started
+
+        # The ping/pong round trip is what the server list shows; the status reply is the fallback
+        token = int(time.time() * 1000)
+        try:
+            started = time.monotonic()
+            sock.sendall(_pack_packet(0x01, struct.pack(">q", token)))
+            packet_id, data = _read_packet(sock)
+            if packet_id == 0x01 and struct.unpack(">q", data[:8])[0] == token:
+                latency = time.monotonic() - started
+        except (OSError, ValueError, struct.error):
+            pass
+
+    return ServerStatus(address, latency, status)
+
+
+class ServerPinger:
+    """Pings a list of servers concurrently in the background and picks the fastest healthy one."""
+
+    def __init__(self, servers: List[str], timeout: float = 3.0):
+        self.servers = servers
+        self.timeout = timeout
+        self._futures: Dict[str, Future] = {}
+
+    def start(self) -> "ServerPinger":
+        """Start pinging every server without waiting for the results."""
+        executor = ThreadPoolExecutor(max_workers=max(1, len(self.servers)), thread_name_prefix="ping")
+        self._futures = {server: executor.submit(ping_server, server, self.timeout) for server in self.servers}
+        executor.shutdown(wait=False)
+        return self
+
+    def best(self) -> Optional[ServerStatus]:
+        """Wait for the pings and get the lowest-latency server that answered."""
+        healthy = []
+        for server, future in self._futures.items():
+            try:
+                result = future.result()
+            except (OSError, ValueError, UnicodeDecodeError) as e:
+                print(f"  {server}: unreachable ({e})")
+                continue
+            print(f"  {server}: {result.latency * 1000:.0f} ms, {result.players} players")
+            healthy.append(result)
+        return min(healthy, key=lambda result: result.latency) if healthy else None
@@ -0,0 +1,58 @@
+"""Helpers for reading installed version JSON files."""
+
+import json
+import os
+from typing import Dict, Any, List, Optional
+
+
+def version_json_path(minecraft_dir: str, version_id: str) -> str:
+    """Get the path of a version's JSON file."""
+    return os.path.join(minecraft_dir, "versions", version_id, f"{version_id}.json")
+
+
+def load_version_json(minecraft_dir: str, version_id: str) -> Optional[Dict[str, Any]]:
+    """Load a version's own JSON file (without resolving inheritsFrom)."""
+    try:
+        with open(version_json_path(minecraft_dir, version_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_version_chain(minecraft_dir: str, version_id: str) -> List[Dict[str, Any]]:
+    """Load a version and every version it inherits from, child first."""
+    chain = []
+    seen = set()
+    current: Optional[str] = version_id
+    while current and current not in seen:
+        seen.add(current)
+        data = load_version_json(minecraft_dir, current)
+        if data is None:
+            raise FileNotFoundError(f"Version {current} is not installed")
+        chain.append(data)
+        current = data.get("inheritsFrom")
+    return chain
+
+
+def maven_path(name: str, extension: str = "jar") -> str:
+    """Convert a Maven coordinate (group:artifact:version[:classifier]) to a repository path."""
+    parts = name.split(":")
+    group, artifact, version = parts[0], parts[1], parts[2]
+    classifier = f"-{parts[3]}" if len(parts) > 3 else ""
+    if "@" in version:
+        version, extension = version.split("@", 1)
+    return "/".join(group.split(".") + [artifact, version, f"{artifact}-{version}{classifier}.{extension}"])
+
+
+def library_paths(library: Dict[str, Any]) -> List[str]:
+    """Get every file (artifact and native classifiers) a library entry can refer to, relative to libraries/."""
+    downloads = library.get("downloads", {})
+    paths = []
+    if "artifact" in downloads and downloads["artifact"].get("path"):
+        paths.append(downloads["artifact"]["path"])
+    elif "name" in library and "downloads" not in library:
+        paths.append(maven_path(library["name"]))
+    for classifier in downloads.get("classifiers", {}).values():
+        if classifier.get("path"):
+            paths.append(classifier["path"])
+    return paths
@@ -0,0 +1,54 @@
+"""Shared fixtures for the QuickMC tests."""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+
+class StaticServer(ThreadingHTTPServer):
+    """Serves fixed responses by path, standing in for Mojang, Fabric meta and Maven."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.routes: Dict[str, bytes] = {}
+        self.requests = []
+        super().__init__(("127.0.0.1", 0), _StaticHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class _StaticHandler(BaseHTTPRequestHandler):
+    server: StaticServer
+
+    def do_GET(self) -> None:
+        self.server.requests.append(self.path)
+        body = self.server.routes.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def static_server():
+    server = StaticServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
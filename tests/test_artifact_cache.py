@@ -0,0 +1,87 @@
+"""Peer-first downloads through the LAN artifact cache, against loopback peers."""
+
+import hashlib
+import os
+import threading
+
+import pytest
+
+import artifact_cache
+from artifact_cache import ArtifactCache, ArtifactStore, CacheServer, PEER_RETRY_DELAY, PeerFetcher
+from downloader import DownloadTask, ParallelDownloader
+
+CONTENT = b"library contents"
+SHA1 = hashlib.sha1(CONTENT).hexdigest()
+
+
+@pytest.fixture
+def peer(tmp_path):
+    """A real cache server whose store holds CONTENT."""
+    minecraft_dir = tmp_path / "peer" / ".minecraft"
+    path = minecraft_dir / "libraries" / "example" / "library.jar"
+    path.parent.mkdir(parents=True)
+    path.write_bytes(CONTENT)
+    store = ArtifactStore(str(minecraft_dir), str(tmp_path / "peer"))
+    store.record(SHA1, str(path))
+
+    server = CacheServer(("127.0.0.1", 0), store)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _cache(tmp_path, peers):
+    minecraft_dir = tmp_path / "local" / ".minecraft"
+    minecraft_dir.mkdir(parents=True)
+    return ArtifactCache(str(minecraft_dir), str(tmp_path / "local"), {"cache": {"peers": peers}})
+
+
+def test_fetch_from_peer(tmp_path, peer, static_server):
+    cache = _cache(tmp_path, [peer])
+    path = os.path.join(cache.store.minecraft_dir, "libraries", "example", "library.jar")
+
+    ParallelDownloader(1, cache).download_all([DownloadTask(static_server.url + "/library.jar", path, SHA1)])
+
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    assert static_server.requests == []
+    assert cache.store.lookup(SHA1) == path
+
+
+def test_corrupt_peer_copy_falls_back_to_upstream(tmp_path, static_server):
+    static_server.routes[f"/sha1/{SHA1}"] = b"corrupted contents"
+    static_server.routes["/library.jar"] = CONTENT
+    cache = _cache(tmp_path, [static_server.url])
+    path = os.path.join(cache.store.minecraft_dir, "libraries", "example", "library.jar")
+
+    assert not cache.fetch(SHA1, path)
+    assert not os.path.exists(path)
+
+    ParallelDownloader(1, cache).download_all([DownloadTask(static_server.url + "/library.jar", path, SHA1)])
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    assert "/library.jar" in static_server.requests
+
+
+def test_failed_peer_is_skipped_until_the_retry_delay(tmp_path, static_server, monkeypatch):
+    # Nothing listens on the port of a closed server
+    dead_peer = static_server.url
+    static_server.shutdown()
+    static_server.server_close()
+
+    now = [1000.0]
+    monkeypatch.setattr(artifact_cache.time, "monotonic", lambda: now[0])
+    fetcher = PeerFetcher([dead_peer], timeout=0.5)
+    attempts = []
+    original = fetcher._fetch_from
+    monkeypatch.setattr(fetcher, "_fetch_from", lambda *args: attempts.append(args) or original(*args))
+    path = str(tmp_path / "library.jar")
+
+    assert not fetcher.fetch(SHA1, path)
+    assert not fetcher.fetch(SHA1, path)
+    assert len(attempts) == 1
+
+    now[0] += PEER_RETRY_DELAY + 1
+    assert not fetcher.fetch(SHA1, path)
+    assert len(attempts) == 2
@@ -0,0 +1,123 @@
+"""Fabric installs from Fabric meta, against a local stand-in for Mojang, Fabric meta and Maven."""
+
+import hashlib
+import io
+import json
+import os
+import zipfile
+
+import pytest
+
+import install_planner
+from installation import InstallationManager
+from launcher import MinecraftLauncher
+from platform_utils import PlatformConfig
+
+MINECRAFT_VERSION = "1.16.5"
+LOADER_VERSION = "0.14.21"
+FABRIC_ID = f"fabric-loader-{LOADER_VERSION}-{MINECRAFT_VERSION}"
+LOGIN_DATA = {"name": "Player", "id": "00000000000000000000000000000000", "access_token": "token"}
+
+
+def _jar(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as jar:
+        for name, content in files.items():
+            jar.writestr(name, content)
+    return buffer.getvalue()
+
+
+def _download(server, path, content):
+    server.routes[path] = content
+    return {"url": server.url + path, "sha1": hashlib.sha1(content).hexdigest(), "size": len(content)}
+
+
+def _publish_versions(server):
+    """Publish a 1.16.5-style vanilla version with LWJGL natives as classifiers, and its Fabric profile."""
+    natives = _jar({"liblwjgl.so": b"native", "META-INF/MANIFEST.MF": b"Manifest-Version: 1.0\r\n"})
+    native_download = {**_download(server, "/libraries/lwjgl-natives.jar", natives),
+                       "path": "org/lwjgl/lwjgl/3.2.2/lwjgl-3.2.2-natives.jar"}
+    vanilla = {
+        "id": MINECRAFT_VERSION,
+        "type": "release",
+        "mainClass": "net.minecraft.client.main.Main",
+        "minecraftArguments": "--username ${auth_player_name} --version ${version_name} --gameDir ${game_directory}",
+        "assetIndex": {"id": "1.16", **_download(server, "/indexes/1.16.json", b'{"objects": {}}')},
+        "downloads": {"client": _download(server, "/client.jar", _jar({"net/minecraft/Main.class": b""}))},
+        "libraries": [{
+            "name": "org.lwjgl:lwjgl:3.2.2",
+            "downloads": {
+                "artifact": {**_download(server, "/libraries/lwjgl.jar", _jar({"org/lwjgl/Version.class": b""})),
+                             "path": "org/lwjgl/lwjgl/3.2.2/lwjgl-3.2.2.jar"},
+                "classifiers": {"natives-linux": native_download, "natives-macos": native_download,
+                                "natives-windows": native_download}
+            },
+            "natives": {"linux": "natives-linux", "osx": "natives-macos", "windows": "natives-windows"},
+            "extract": {"exclude": ["META-INF/"]}
+        }]
+    }
+    vanilla_json = json.dumps(vanilla).encode()
+    server.routes["/mc/version_manifest_v2.json"] = json.dumps({"versions": [{
+        "id": MINECRAFT_VERSION,
+        "url": server.url + "/mc/1.16.5.json",
+        "sha1": hashlib.sha1(vanilla_json).hexdigest()
+    }]}).encode()
+    server.routes["/mc/1.16.5.json"] = vanilla_json
+
+    loader_path = f"net/fabricmc/fabric-loader/{LOADER_VERSION}/fabric-loader-{LOADER_VERSION}.jar"
+    server.routes[f"/maven/{loader_path}"] = _jar({"net/fabricmc/loader/Loader.class": b""})
+    server.routes["/v2/versions/loader"] = json.dumps([{"version": LOADER_VERSION, "stable": True}]).encode()
+    server.routes[f"/v2/versions/loader/{MINECRAFT_VERSION}/{LOADER_VERSION}/profile/json"] = json.dumps({
+        "id": FABRIC_ID,
+        "inheritsFrom": MINECRAFT_VERSION,
+        "type": "release",
+        "mainClass": "net.fabricmc.loader.impl.launch.knot.KnotClient",
+        "arguments": {"game": [], "jvm": []},
+        "libraries": [{"name": f"net.fabricmc:fabric-loader:{LOADER_VERSION}", "url": server.url + "/maven/"}]
+    }).encode()
+
+
+@pytest.fixture
+def config(static_server, monkeypatch):
+    _publish_versions(static_server)
+    monkeypatch.setattr(install_planner, "VERSION_MANIFEST_URL", static_server.url + "/mc/version_manifest_v2.json")
+
+    config = PlatformConfig.get_default_config(resolve=False)
+    config["java"]["executable_path"] = "java"
+    config["fabric"].update({"auto_install": True, "loader_version": "latest", "meta_url": static_server.url})
+    config["install"]["enable_progress_bar"] = False
+    config["launch"]["merged_classpath"] = False
+    config["profiling"] = {"enabled": False}
+    return PlatformConfig.resolve_defaults(config)
+
+
+def _library_path(command):
+    return next(arg.split("=", 1)[1] for arg in command if arg.startswith("-Djava.library.path="))
+
+
+def test_fabric_install_extracts_inherited_natives_for_launch(tmp_path, config):
+    minecraft_dir = str(tmp_path / ".minecraft")
+
+    version = InstallationManager(minecraft_dir, config).install_minecraft_version(MINECRAFT_VERSION)
+
+    assert version == FABRIC_ID
+    assert os.path.isfile(os.path.join(minecraft_dir, "versions", FABRIC_ID, f"{FABRIC_ID}.json"))
+    assert os.path.isfile(os.path.join(minecraft_dir, "libraries", "net", "fabricmc", "fabric-loader",
+                                       LOADER_VERSION, f"fabric-loader-{LOADER_VERSION}.jar"))
+
+    command = MinecraftLauncher(minecraft_dir, config).get_command(version, LOGIN_DATA)
+    natives_dir = _library_path(command)
+    assert os.listdir(natives_dir) == ["liblwjgl.so"]
+    assert "net.fabricmc.loader.impl.launch.knot.KnotClient" in command
+
+
+def test_installed_pinned_loader_skips_fabric_meta(tmp_path, config, static_server):
+    minecraft_dir = str(tmp_path / ".minecraft")
+    InstallationManager(minecraft_dir, config).install_minecraft_version(MINECRAFT_VERSION)
+    static_server.requests.clear()
+
+    config["fabric"]["loader_version"] = LOADER_VERSION
+    version = InstallationManager(minecraft_dir, config).install_minecraft_version(MINECRAFT_VERSION)
+
+    assert version == FABRIC_ID
+    assert static_server.requests == []
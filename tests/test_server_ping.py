@@ -0,0 +1,151 @@
+"""Quick-join server selection, against local Server List Ping responders."""
+
+import json
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+
+from platform_utils import PlatformConfig
+from server_ping import ServerPinger, parse_address
+
+
+def _varint(value):
+    data = b""
+    while True:
+        byte, value = value & 0x7F, value >> 7
+        data += bytes([byte | (0x80 if value else 0)])
+        if not value:
+            return data
+
+
+def _read_varint(stream):
+    value = 0
+    for shift in range(0, 35, 7):
+        byte = stream.read(1)[0]
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value
+    raise ValueError("VarInt is too long")
+
+
+def _read_packet(stream):
+    data = stream.read(_read_varint(stream))
+    return data[0], data[1:]
+
+
+def _write_packet(stream, packet_id, payload):
+    body = _varint(packet_id) + payload
+    stream.write(_varint(len(body)) + body)
+    stream.flush()
+
+
+class SlpResponder(socketserver.ThreadingTCPServer):
+    """Answers status and ping requests after a fixed delay, like a server at that latency."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, delay, online, status=None):
+        self.delay = delay
+        self.online = online
+        self.status = status
+        super().__init__(("127.0.0.1", 0), _SlpHandler)
+
+    @property
+    def address(self):
+        return f"127.0.0.1:{self.server_address[1]}"
+
+
+class _SlpHandler(socketserver.StreamRequestHandler):
+    server: SlpResponder
+
+    def handle(self):
+        packet_id, _ = _read_packet(self.rfile)  # Handshake
+        assert packet_id == 0x00
+        packet_id, _ = _read_packet(self.rfile)  # Status request
+        assert packet_id == 0x00
+
+        status = json.dumps(self.server.status if self.server.status is not None else {
+            "version": {"name": "1.20.4", "protocol": 765},
+            "players": {"online": self.server.online, "max": 20},
+            "description": {"text": "test"}
+        }).encode("utf-8")
+        time.sleep(self.server.delay)
+        _write_packet(self.wfile, 0x00, _varint(len(status)) + status)
+
+        packet_id, payload = _read_packet(self.rfile)
+        assert packet_id == 0x01
+        time.sleep(self.server.delay)
+        _write_packet(self.wfile, 0x01, payload)
+
+
+@pytest.fixture
+def responders():
+    servers = [SlpResponder(0.3, 12), SlpResponder(0.02, 3)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield servers
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _unused_address():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"127.0.0.1:{sock.getsockname()[1]}"
+
+
+def test_quick_join_picks_the_lowest_latency_server(responders):
+    slow, fast = responders
+    config = PlatformConfig.get_default_config(resolve=False)
+    config["launch"]["quick_join"] = [slow.address, _unused_address(), fast.address]
+
+    best = ServerPinger(config["launch"]["quick_join"], config["launch"]["quick_join_timeout"]).start().best()
+
+    assert best.address == fast.address
+    assert best.players == "3/20"
+    assert best.latency < slow.delay
+
+
+@pytest.mark.parametrize("status", ["x", [], 5])
+def test_quick_join_skips_a_status_that_is_not_an_object(responders, status):
+    broken = SlpResponder(0, 0, status)
+    threading.Thread(target=broken.serve_forever, daemon=True).start()
+    try:
+        best = ServerPinger([broken.address, responders[0].address], timeout=2).start().best()
+    finally:
+        broken.shutdown()
+        broken.server_close()
+
+    assert best.address == responders[0].address
+
+
+def test_players_without_a_players_object():
+    broken = SlpResponder(0, 0, {"players": 5})
+    threading.Thread(target=broken.serve_forever, daemon=True).start()
+    try:
+        best = ServerPinger([broken.address], timeout=2).start().best()
+    finally:
+        broken.shutdown()
+        broken.server_close()
+
+    assert best.players == "?/?"
+
+
+def test_quick_join_without_a_healthy_server(capsys):
+    assert ServerPinger([_unused_address()], timeout=1).start().best() is None
+    assert "unreachable" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("mc.example.com", ("mc.example.com", 25565)),
+    ("mc.example.com:25570", ("mc.example.com", 25570)),
+    ("[::1]:25570", ("::1", 25570)),
+    ("[::1]", ("::1", 25565))
+])
+def test_parse_address(address, expected):
+    assert parse_address(address) == expected